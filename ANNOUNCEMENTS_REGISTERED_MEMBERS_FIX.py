@@ -28,9 +28,16 @@ class Announcement(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [models.Index(fields=['target_audience', 'updated_at'])]  # ?since= feed
     
     def __str__(self):
         return self.title
+
+class AnnouncementTombstone(models.Model):
+    """An announcement deleted, or moved out of an audience, kept for the ?since= feed"""
+    announcement_id = models.IntegerField()
+    audience = models.CharField(max_length=50)
+    removed_at = models.DateTimeField(auto_now_add=True, db_index=True)
 '''
 
 ANNOUNCEMENTS_VIEWS_FIX = '''
@@ -41,25 +48,49 @@ from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
 from rest_framework import status
 from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from response_cache.versions import cached_payload
+from .feed import (InvalidCursor, build_feed, current_feed, decode_cursor, encode_cursor,
+                   feed_changes, feed_etag, feed_expired_cursor, viewer_audiences)
 
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
 def announcements_list(request):
     if request.method == 'GET':
-        # Get all active announcements
-        announcements = Announcement.objects.filter(is_active=True).order_by('-created_at')
+        # Active announcements for this user's audiences, cached until an admin changes one
+        audiences = viewer_audiences(request.user)
+        now = timezone.now()
+        announcements, last_modified = current_feed(
+            cached_payload('announcements', audiences, build_feed), now
+        )
+        etag = feed_etag(audiences, last_modified)
+        modified_at = int(last_modified.timestamp()) if last_modified else None
         
-        data = [{
-            'id': announcement.id,
-            'title': announcement.title,
-            'content': announcement.content,
-            'priority': announcement.priority,
-            'created_by': announcement.created_by.username,
-            'created_at': announcement.created_at.isoformat(),
-            'expires_at': announcement.expires_at.isoformat() if announcement.expires_at else None,
-        } for announcement in announcements]
+        # If-None-Match / If-Modified-Since -> 304 when nothing changed
+        response = get_conditional_response(request, etag=etag, last_modified=modified_at)
+        if response is None:
+            since = request.query_params.get('since')
+            if since:
+                try:
+                    since = decode_cursor(since)
+                except InvalidCursor:
+                    return Response({'error': 'Invalid cursor'}, status=status.HTTP_400_BAD_REQUEST)
+            
+            if since and not feed_expired_cursor(since, now):
+                # Only what changed after the cursor; the client merges by id
+                changed, removed = feed_changes(audiences, since, now, last_modified)
+                response = Response({'announcements': changed, 'removed': removed,
+                                     'cursor': encode_cursor(now)})
+            else:
+                response = Response({'announcements': announcements, 'reset': bool(since),
+                                     'cursor': encode_cursor(now)})
         
-        return Response({'announcements': data})
+        response['ETag'] = etag
+        if modified_at:
+            response['Last-Modified'] = http_date(modified_at)
+        response['Cache-Control'] = 'private, no-cache'
+        return response
     
     elif request.method == 'POST':
         # Only admins can create announcements
@@ -168,85 +199,344 @@ def announcement_detail(request, announcement_id):
         }, status=status.HTTP_204_NO_CONTENT)
 '''
 
-# ===== 2. REGISTERED MEMBERS IMPLEMENTATION =====
-REGISTERED_MEMBERS_VIEW = '''
-# admin_panel/views.py - Add registered members endpoint
+ANNOUNCEMENTS_FEED = '''
+# announcements/feed.py - Create this file
+#
+# GET /announcements/             active announcements for the user's audiences
+# GET /announcements/?since=<c>   only what changed after cursor c:
+#                                 'announcements' to add or replace by id and
+#                                 'removed' ids (deleted, deactivated, expired
+#                                 or moved to another audience)
+#
+# Both return 'cursor' for the next poll, plus ETag and Last-Modified, so a
+# poll with If-None-Match gets a 304 when nothing changed. A cursor older than
+# ANNOUNCEMENT_TOMBSTONE_DAYS gets the full list back with 'reset': true.
 
-@api_view(['GET'])
-@permission_classes([IsAdminUser])
-def get_registered_members(request):
-    """Get all registered members with their details"""
+import base64
+import binascii
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Max, Q
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Announcement, AnnouncementTombstone
+
+FEED_FIELDS = ('id', 'title', 'content', 'priority', 'created_by__username', 'created_at', 'expires_at')
+
+class InvalidCursor(ValueError):
+    pass
+
+def encode_cursor(moment):
+    return base64.urlsafe_b64encode(moment.isoformat().encode()).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    try:
+        moment = parse_datetime(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursor(cursor)
+    if moment is None or timezone.is_naive(moment):
+        raise InvalidCursor(cursor)
+    return moment
+
+def tombstone_cutoff(now):
+    # Tombstones older than this are pruned, so older cursors can miss deletions
+    return now - timedelta(days=getattr(settings, 'ANNOUNCEMENT_TOMBSTONE_DAYS', 30))
+
+def feed_expired_cursor(since, now):
+    return since < tombstone_cutoff(now)
+
+def viewer_audiences(user):
+    # target_audience values this user may see
+    return ['all', 'members', 'admins'] if user.is_staff else ['all', 'members']
+
+def feed_item(row):
+    return {
+        'id': row['id'],
+        'title': row['title'],
+        'content': row['content'],
+        'priority': row['priority'],
+        'created_by': row['created_by__username'],
+        'created_at': row['created_at'].isoformat(),
+        'expires_at': row['expires_at'].isoformat() if row['expires_at'] else None,
+    }
+
+def build_feed(audiences):
+    """Visible announcements plus the newest change time; cached by announcements_list"""
+    now = timezone.now()
+    live = Q(expires_at__isnull=True) | Q(expires_at__gt=now)
+    # values() joins created_by instead of loading each author separately
+    rows = list(Announcement.objects.filter(live, is_active=True, target_audience__in=audiences)
+                .order_by('-created_at').values(*FEED_FIELDS))
+    
+    changes = Announcement.objects.filter(target_audience__in=audiences).aggregate(
+        updated=Max('updated_at'),
+        expired=Max('expires_at', filter=Q(expires_at__lte=now)),
+    )
+    removed = AnnouncementTombstone.objects.filter(audience__in=audiences).aggregate(
+        removed=Max('removed_at')
+    )
+    stamps = [changes['updated'], changes['expired'], removed['removed']]
     
-    # Get users with approved applications (registered members)
-    approved_applications = MembershipApplication.objects.filter(
-        status='approved'
-    ).select_related('user')
+    return {
+        'announcements': [feed_item(row) for row in rows],
+        'expiring': [(row['id'], row['expires_at']) for row in rows if row['expires_at']],
+        'last_modified': max((stamp for stamp in stamps if stamp), default=None),
+    }
+
+def current_feed(feed, now):
+    """(announcements, last_modified) with whatever expired since the feed was built removed"""
+    expired = {pk: expires_at for pk, expires_at in feed['expiring'] if expires_at <= now}
+    if not expired:
+        return feed['announcements'], feed['last_modified']
     
-    # Get all users with their profiles
-    users_with_profiles = User.objects.select_related('userprofile').all()
+    stamps = [stamp for stamp in [feed['last_modified'], *expired.values()] if stamp]
+    announcements = [item for item in feed['announcements'] if item['id'] not in expired]
+    return announcements, max(stamps)
+
+def feed_etag(audiences, last_modified):
+    stamp = int(last_modified.timestamp() * 1000000) if last_modified else 0
+    audience_key = '-'.join(sorted(audiences))
+    return f'"announcements-{audience_key}-{stamp}"'
+
+def feed_changes(audiences, since, now, last_modified):
+    """(announcements to add or replace, ids to remove) after since"""
+    # Rows saved just before the cursor but committed after it still get sent
+    since = since - timedelta(seconds=getattr(settings, 'ANNOUNCEMENT_FEED_OVERLAP_SECONDS', 5))
+    if last_modified is None or last_modified <= since:
+        return [], []  # Nothing changed; no queries
     
-    members_data = []
+    rows = Announcement.objects.filter(target_audience__in=audiences).filter(
+        Q(updated_at__gt=since) | Q(expires_at__gt=since, expires_at__lte=now)
+    ).order_by('-created_at').values(*FEED_FIELDS, 'is_active')
     
-    for user in users_with_profiles:
-        # Get user's approved application
-        approved_app = approved_applications.filter(user=user).first()
+    changed, removed = [], set()
+    for row in rows:
+        if row['is_active'] and (row['expires_at'] is None or row['expires_at'] > now):
+            changed.append(feed_item(row))
+        else:
+            removed.add(row['id'])
+    
+    # A row moved between two audiences this user sees is changed, not removed
+    visible = {item['id'] for item in changed}
+    tombstones = AnnouncementTombstone.objects.filter(
+        audience__in=audiences, removed_at__gt=since
+    ).values_list('announcement_id', flat=True)
+    removed.update(pk for pk in tombstones if pk not in visible)
+    
+    return changed, sorted(removed)
+
+def record_deleted(sender, instance, **kwargs):
+    AnnouncementTombstone.objects.create(announcement_id=instance.id, audience=instance.target_audience)
+    AnnouncementTombstone.objects.filter(removed_at__lt=tombstone_cutoff(timezone.now())).delete()
+
+def record_audience_move(sender, instance, created, **kwargs):
+    # _cached_audience is set by the response cache's pre_save handler
+    old = getattr(instance, '_cached_audience', None)
+    if not created and old and old != instance.target_audience:
+        AnnouncementTombstone.objects.create(announcement_id=instance.id, audience=old)
+
+def connect_feed_signals():
+    post_save.connect(record_audience_move, sender=Announcement)
+    post_delete.connect(record_deleted, sender=Announcement)
+'''
+
+# ===== 2. REGISTERED MEMBERS IMPLEMENTATION =====
+REGISTERED_MEMBERS_VIEW = '''
+# admin_panel/views.py - Add registered members endpoint
+
+from django.db.models import (
+    Case, CharField, Count, DecimalField, IntegerField, OuterRef, Q, Subquery, Sum, Value, When,
+)
+from django.db.models.functions import Coalesce
+
+from .exports import InvalidExport, export_chunk_size, export_response
+from .filters import InvalidFilter
+from .pagination import get_page_size
+
+MEMBER_STATUSES = ['active', 'pending', 'inactive', 'suspended']
+
+
+def user_subquery(model, aggregate, output_field):
+    """Correlated per-user aggregate over model, evaluated inside the member query"""
+    return Coalesce(
+        Subquery(
+            model.objects.filter(user=OuterRef('pk'))
+            .order_by()
+            .values('user')
+            .annotate(value=aggregate)
+            .values('value'),
+            output_field=output_field,
+        ),
+        Value(0),
+        output_field=output_field,
+    )
+
+
+def registered_members_queryset():
+    """Every user with profile, approved application and statistics annotated in SQL"""
+    approved_app = MembershipApplication.objects.filter(
+        user=OuterRef('pk'), status='approved'
+    ).order_by('created_at', 'id')
+    money = DecimalField(max_digits=12, decimal_places=2)
+
+    return User.objects.annotate(
+        # Profile information
+        membership_type=Coalesce('userprofile__membership_type', Value('none'), output_field=CharField()),
+        membership_status=Coalesce('userprofile__membership_status', Value('inactive'), output_field=CharField()),
+        shares_owned=Coalesce('userprofile__shares_owned', Value(0), output_field=IntegerField()),
+        phone=Coalesce('userprofile__phone', Value(''), output_field=CharField()),
+
+        # Application information
+        application_date=Subquery(approved_app.values('created_at')[:1]),
+        application_type=Subquery(approved_app.values('membership_type')[:1]),
+
+        # Statistics
+        total_payments=user_subquery(MembershipPayment, Count('id'), IntegerField()),
+        total_claims=user_subquery(Claim, Count('id'), IntegerField()),
+        total_shares_purchased=user_subquery(SharePurchase, Count('id'), IntegerField()),
+
+        # Financial info
+        total_paid=user_subquery(MembershipPayment, Sum('amount', filter=Q(status='approved')), money),
+
+        # Active members first
+        status_rank=Case(When(membership_status='active', then=Value(0)), default=Value(1)),
+    )
+
+
+def filter_registered_members(request):
+    """registered_members_queryset() narrowed by ?membership_status= and ?is_active="""
+    members = registered_members_queryset()
+
+    membership_status = request.query_params.get('membership_status')
+    if membership_status:
+        if membership_status not in MEMBER_STATUSES:
+            raise InvalidFilter('Invalid membership_status')
+        members = members.filter(membership_status=membership_status)
+
+    is_active = request.query_params.get('is_active')
+    if is_active in ('true', 'false'):
+        members = members.filter(is_active=is_active == 'true')
+
+    return members
+
+
+MEMBER_COLUMNS = [
+    'id', 'username', 'email', 'first_name', 'last_name', 'date_joined', 'is_active', 'is_staff',
+    'membership_type', 'membership_status', 'shares_owned', 'phone',
+    'application_date', 'application_type',
+    'total_payments', 'total_claims', 'total_shares_purchased', 'total_paid',
+]
+
+
+# member_row() keys, in export column order
+MEMBER_EXPORT_HEADER = [
+    'id', 'username', 'email', 'first_name', 'last_name', 'full_name', 'date_joined',
+    'is_active', 'is_staff', 'membership_type', 'membership_status', 'shares_owned', 'phone',
+    'has_approved_application', 'application_date', 'application_type',
+    'total_payments', 'total_claims', 'total_shares_purchased', 'total_paid',
+]
+
+
+def ordered_members(members):
+    # Sort by membership status, shares owned (desc), then date joined
+    return members.order_by('status_rank', '-shares_owned', 'date_joined', 'id').values(*MEMBER_COLUMNS)
+
+
+def member_row(row):
+    return {
+        'id': row['id'],
+        'username': row['username'],
+        'email': row['email'],
+        'first_name': row['first_name'],
+        'last_name': row['last_name'],
+        'full_name': f"{row['first_name']} {row['last_name']}".strip() or row['username'],
+        'date_joined': row['date_joined'].isoformat(),
+        'is_active': row['is_active'],
+        'is_staff': row['is_staff'],
         
-        # Get user profile
-        try:
-            profile = user.userprofile
-        except:
-            profile = None
+        # Profile information
+        'membership_type': row['membership_type'],
+        'membership_status': row['membership_status'],
+        'shares_owned': row['shares_owned'],
+        'phone': row['phone'],
         
-        member_data = {
-            'id': user.id,
-            'username': user.username,
-            'email': user.email,
-            'first_name': user.first_name,
-            'last_name': user.last_name,
-            'full_name': f"{user.first_name} {user.last_name}".strip() or user.username,
-            'date_joined': user.date_joined.isoformat(),
-            'is_active': user.is_active,
-            'is_staff': user.is_staff,
-            
-            # Profile information
-            'membership_type': profile.membership_type if profile else 'none',
-            'membership_status': profile.membership_status if profile else 'inactive',
-            'shares_owned': profile.shares_owned if profile else 0,
-            'phone': profile.phone if profile else '',
-            
-            # Application information
-            'has_approved_application': bool(approved_app),
-            'application_date': approved_app.created_at.isoformat() if approved_app else None,
-            'application_type': approved_app.membership_type if approved_app else None,
-            
-            # Statistics
-            'total_payments': MembershipPayment.objects.filter(user=user).count(),
-            'total_claims': Claim.objects.filter(user=user).count(),
-            'total_shares_purchased': SharePurchase.objects.filter(user=user).count(),
-            
-            # Financial info
-            'total_paid': float(MembershipPayment.objects.filter(
-                user=user, status='approved'
-            ).aggregate(total=models.Sum('amount'))['total'] or 0),
-        }
+        # Application information
+        'has_approved_application': row['application_date'] is not None,
+        'application_date': row['application_date'].isoformat() if row['application_date'] else None,
+        'application_type': row['application_type'],
         
-        members_data.append(member_data)
-    
-    # Sort by membership status and date joined
-    members_data.sort(key=lambda x: (
-        x['membership_status'] != 'active',  # Active members first
-        -x['shares_owned'],  # Then by shares owned (desc)
-        x['date_joined']  # Then by join date
-    ))
+        # Statistics
+        'total_payments': row['total_payments'],
+        'total_claims': row['total_claims'],
+        'total_shares_purchased': row['total_shares_purchased'],
+        
+        # Financial info
+        'total_paid': float(row['total_paid']),
+    }
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def get_registered_members(request):
+    """Get registered members with their details, one page at a time
+
+    Query params:
+      ?membership_status=active|pending|inactive|suspended
+      ?is_active=true|false
+      ?page=1&page_size=50
+    """
+    try:
+        members = filter_registered_members(request)
+    except InvalidFilter as e:
+        return Response({'error': str(e)}, status=400)
+
+    # Status summary for the filtered set in one conditional aggregate
+    summary = members.aggregate(
+        total_count=Count('id'),
+        active_members=Count('id', filter=Q(membership_status='active')),
+        pending_members=Count('id', filter=Q(membership_status='pending')),
+        inactive_members=Count('id', filter=Q(membership_status='inactive')),
+    )
+
+    try:
+        page = max(1, int(request.query_params.get('page', 1)))
+    except (TypeError, ValueError):
+        page = 1
+    page_size = get_page_size(request)
+    offset = (page - 1) * page_size
+
+    rows = ordered_members(members)[offset:offset + page_size]
+    members_data = [member_row(row) for row in rows]
     
     return Response({
         'members': members_data,
-        'total_count': len(members_data),
-        'active_members': len([m for m in members_data if m['membership_status'] == 'active']),
-        'pending_members': len([m for m in members_data if m['membership_status'] == 'pending']),
-        'inactive_members': len([m for m in members_data if m['membership_status'] == 'inactive']),
+        'page': page,
+        'page_size': page_size,
+        'has_more': offset + len(members_data) < summary['total_count'],
+        **summary,
     })
 
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def export_registered_members(request, file_format):
+    """Stream every member matching get_registered_members' filters as CSV or XLSX"""
+    try:
+        members = filter_registered_members(request)
+    except InvalidFilter as e:
+        return Response({'error': str(e)}, status=400)
+
+    rows = (
+        [member_row(row)[key] for key in MEMBER_EXPORT_HEADER]
+        for row in ordered_members(members).iterator(chunk_size=export_chunk_size())
+    )
+    try:
+        return export_response(file_format, 'members', MEMBER_EXPORT_HEADER, rows)
+    except InvalidExport as e:
+        return Response({'error': str(e)}, status=400)
+
 @api_view(['GET'])
 @permission_classes([IsAdminUser])
 def get_member_details(request, user_id):
@@ -340,6 +630,7 @@ urlpatterns = [
     # ... existing patterns ...
     path('members/', views.get_registered_members, name='get_registered_members'),
     path('members/<int:user_id>/', views.get_member_details, name='get_member_details'),
+    path('members/export/<str:file_format>/', views.export_registered_members, name='export_registered_members'),
 ]
 '''
 
@@ -360,7 +651,10 @@ print("=" * 50)
 print("FIXES NEEDED:")
 print("1. Update Announcement model with all required fields")
 print("2. Fix announcement views to handle validation properly")
-print("3. Add registered members endpoint")
+print("   (GET is cached per audience, see RESPONSE_CACHE_SYSTEM.py)")
+print("   and create announcements/feed.py from ANNOUNCEMENTS_FEED (ETag, ?since= deltas)")
+print("3. Add registered members endpoint (single query, ?membership_status=&page=&page_size=)")
+print("   and members/export/csv/ (or xlsx) with the same filters")
 print("4. Update URL patterns")
 print("5. Run migrations")
 print("\nThis will fix the 400 errors and add member management")
\ No newline at end of file
@@ -4,9 +4,11 @@
 APPLICATION_ENHANCEMENTS = '''
 # applications/views.py - Enhanced application submission
 
-from django.core.mail import send_mail
+from django.db import transaction
 from django.template.loader import render_to_string
 from django.conf import settings
+from notifications.outbox import queue_email
+from uploads.chunked import upload_or_file
 import json
 
 @csrf_exempt
@@ -16,48 +18,49 @@ def submit_application(request):
         return JsonResponse({'error': 'Authentication required'}, status=401)
     
     try:
-        # Create application with ALL form data
-        application = MembershipApplication.objects.create(
-            user=request.user,
-            membership_type=request.POST.get('membership_type'),
+        with transaction.atomic():
+            # Create application with ALL form data
+            application = MembershipApplication.objects.create(
+                user=request.user,
+                membership_type=request.POST.get('membership_type'),
+                
+                # Personal Information
+                full_name=request.POST.get('first_name', '') + ' ' + request.POST.get('last_name', ''),
+                national_id=request.POST.get('id_number'),
+                date_of_birth=request.POST.get('date_of_birth'),
+                gender=request.POST.get('gender'),
+                occupation=request.POST.get('occupation'),
+                
+                # Contact Information
+                email=request.POST.get('email'),
+                phone=request.POST.get('phone'),
+                address=f"{request.POST.get('address', '')}, {request.POST.get('city', '')}, {request.POST.get('state', '')} {request.POST.get('zip_code', '')}",
+                
+                # Emergency Contact
+                emergency_contact_name=request.POST.get('emergency_name'),
+                emergency_contact_phone=request.POST.get('emergency_phone'),
+                emergency_contact_relationship=request.POST.get('emergency_relationship'),
+                
+                # For Double Membership
+                spouse_full_name=request.POST.get('spouse_first_name', '') + ' ' + request.POST.get('spouse_last_name', ''),
+                spouse_national_id=request.POST.get('spouse_id_number'),
+                spouse_date_of_birth=request.POST.get('spouse_date_of_birth'),
+                spouse_gender=request.POST.get('spouse_gender'),
+                spouse_occupation=request.POST.get('spouse_occupation'),
+                spouse_phone=request.POST.get('spouse_phone'),
+                
+                # JSON fields for children and step family
+                children_info=json.loads(request.POST.get('children_info', '[]')),
+                step_parents_info=json.loads(request.POST.get('step_parents_info', '[]')),
+                step_siblings_info=json.loads(request.POST.get('step_siblings_info', '[]')),
+                
+                # Documents - a multipart file or a chunked upload token (<field>_upload)
+                id_document=upload_or_file(request, 'id_document'),
+                spouse_id_document=upload_or_file(request, 'spouse_id_document'),
+            )
             
-            # Personal Information
-            full_name=request.POST.get('first_name', '') + ' ' + request.POST.get('last_name', ''),
-            national_id=request.POST.get('id_number'),
-            date_of_birth=request.POST.get('date_of_birth'),
-            gender=request.POST.get('gender'),
-            occupation=request.POST.get('occupation'),
-            
-            # Contact Information
-            email=request.POST.get('email'),
-            phone=request.POST.get('phone'),
-            address=f"{request.POST.get('address', '')}, {request.POST.get('city', '')}, {request.POST.get('state', '')} {request.POST.get('zip_code', '')}",
-            
-            # Emergency Contact
-            emergency_contact_name=request.POST.get('emergency_name'),
-            emergency_contact_phone=request.POST.get('emergency_phone'),
-            emergency_contact_relationship=request.POST.get('emergency_relationship'),
-            
-            # For Double Membership
-            spouse_full_name=request.POST.get('spouse_first_name', '') + ' ' + request.POST.get('spouse_last_name', ''),
-            spouse_national_id=request.POST.get('spouse_id_number'),
-            spouse_date_of_birth=request.POST.get('spouse_date_of_birth'),
-            spouse_gender=request.POST.get('spouse_gender'),
-            spouse_occupation=request.POST.get('spouse_occupation'),
-            spouse_phone=request.POST.get('spouse_phone'),
-            
-            # JSON fields for children and step family
-            children_info=json.loads(request.POST.get('children_info', '[]')),
-            step_parents_info=json.loads(request.POST.get('step_parents_info', '[]')),
-            step_siblings_info=json.loads(request.POST.get('step_siblings_info', '[]')),
-            
-            # Documents
-            id_document=request.FILES.get('id_document'),
-            spouse_id_document=request.FILES.get('spouse_id_document'),
-        )
-        
-        # Send application confirmation email
-        send_application_email(application)
+            # Queue confirmation email - saved in the same transaction as the application
+            send_application_email(application)
         
         return JsonResponse({
             'success': True,
@@ -70,155 +73,586 @@ def submit_application(request):
         return JsonResponse({'error': str(e)}, status=400)
 
 def send_application_email(application):
-    """Send application confirmation email"""
-    try:
-        subject = f'Pamoja Membership Application Received - {application.membership_type.title()}'
-        
-        context = {
-            'user_name': application.full_name,
-            'application_type': application.membership_type.title(),
-            'application_id': application.id,
-            'submission_date': application.created_at.strftime('%B %d, %Y'),
-        }
-        
-        # HTML email template
-        html_message = f"""
-        <h2>Application Received Successfully!</h2>
-        <p>Dear {context['user_name']},</p>
-        
-        <p>Thank you for submitting your <strong>{context['application_type']} Membership</strong> application to Pamoja.</p>
-        
-        <div style="background: #f8f9fa; padding: 15px; border-radius: 5px; margin: 20px 0;">
-            <h3>Application Details:</h3>
-            <ul>
-                <li><strong>Application ID:</strong> #{context['application_id']}</li>
-                <li><strong>Type:</strong> {context['application_type']}</li>
-                <li><strong>Submitted:</strong> {context['submission_date']}</li>
-                <li><strong>Status:</strong> Pending Review</li>
-            </ul>
-        </div>
-        
-        <p><strong>Next Steps:</strong></p>
-        <ol>
-            <li>Our admin team will review your application</li>
-            <li>You will receive an email notification once reviewed</li>
-            <li>If approved, you can proceed with membership payments</li>
-        </ol>
-        
-        <p>You can track your application status in your dashboard.</p>
-        
-        <p>Best regards,<br>Pamoja Team</p>
-        """
-        
-        send_mail(
-            subject=subject,
-            message=f"Application received for {context['application_type']} membership. Application ID: #{context['application_id']}",
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[application.email],
-            html_message=html_message,
-            fail_silently=False,
-        )
-        
-    except Exception as e:
-        print(f"Email sending failed: {e}")
+    """Queue the application confirmation email for the outbox worker"""
+    subject = f'Pamoja Membership Application Received - {application.membership_type.title()}'
+    
+    context = {
+        'user_name': application.full_name,
+        'application_type': application.membership_type.title(),
+        'application_id': application.id,
+        'submission_date': application.created_at.strftime('%B %d, %Y'),
+    }
+    
+    # HTML email template
+    html_message = f"""
+    <h2>Application Received Successfully!</h2>
+    <p>Dear {context['user_name']},</p>
+    
+    <p>Thank you for submitting your <strong>{context['application_type']} Membership</strong> application to Pamoja.</p>
+    
+    <div style="background: #f8f9fa; padding: 15px; border-radius: 5px; margin: 20px 0;">
+        <h3>Application Details:</h3>
+        <ul>
+            <li><strong>Application ID:</strong> #{context['application_id']}</li>
+            <li><strong>Type:</strong> {context['application_type']}</li>
+            <li><strong>Submitted:</strong> {context['submission_date']}</li>
+            <li><strong>Status:</strong> Pending Review</li>
+        </ul>
+    </div>
+    
+    <p><strong>Next Steps:</strong></p>
+    <ol>
+        <li>Our admin team will review your application</li>
+        <li>You will receive an email notification once reviewed</li>
+        <li>If approved, you can proceed with membership payments</li>
+    </ol>
+    
+    <p>You can track your application status in your dashboard.</p>
+    
+    <p>Best regards,<br>Pamoja Team</p>
+    """
+    
+    queue_email(
+        subject=subject,
+        message=f"Application received for {context['application_type']} membership. Application ID: #{context['application_id']}",
+        recipient_list=[application.email],
+        html_message=html_message,
+    )
 '''
 
 # ===== 2. USER DASHBOARD ENHANCEMENTS =====
 DASHBOARD_ENHANCEMENTS = '''
 # users/views.py - Enhanced dashboard with complete user data
+#
+# The one get_user_dashboard. It costs the same number of queries however
+# much history a member has: the profile, the share ledger summary (2), one
+# conditional aggregate per table for the stats (4) and the newest
+# DASHBOARD_SECTION_SIZE rows of each list (5). next_cursors holds a cursor
+# for every list with older rows; fetch them with
+# GET /api/user/dashboard/?section=payments&cursor=<cursor>
 
-@csrf_exempt
-def get_user_dashboard(request):
-    if not request.user.is_authenticated:
-        return JsonResponse({'error': 'Authentication required'}, status=401)
+from decimal import Decimal
+
+from django.conf import settings
+from django.db.models import Count, DecimalField, Q, Sum, Value
+from django.db.models.functions import Coalesce
+
+from admin_panel.pagination import InvalidCursor, decode_cursor, encode_cursor
+from shares.ledger import share_summary
+
+def serialize_application(app):
+    return {
+        'id': app.id,
+        'membership_type': app.membership_type,
+        'status': app.status,
+        'full_name': app.full_name,
+        'email': app.email,
+        'phone': app.phone,
+        'created_at': app.created_at.isoformat(),
+        'admin_notes': app.admin_notes,
+        'can_edit': app.status == 'pending',  # Only pending applications can be edited
+    }
+
+def serialize_claim(claim):
+    return {
+        'id': claim.id,
+        'title': claim.title,
+        'status': claim.status,
+        'amount_requested': str(claim.amount_requested),
+        'amount_approved': str(claim.amount_approved) if claim.amount_approved else None,
+        'created_at': claim.created_at.isoformat(),
+        'admin_response': claim.admin_response,
+    }
+
+def serialize_payment(payment):
+    return {
+        'id': payment.id,
+        'payment_type': payment.payment_type,
+        'amount': str(payment.amount),
+        'payment_method': payment.payment_method,
+        'status': payment.status,
+        'created_at': payment.created_at.isoformat(),
+        'admin_notes': payment.admin_notes,
+        'can_print_receipt': payment.status == 'approved',
+    }
+
+def serialize_share(share):
+    return {
+        'id': share.id,
+        'shares_requested': share.shares_requested,
+        'amount': str(share.amount),
+        'status': share.status,
+        'created_at': share.created_at.isoformat(),
+    }
+
+def serialize_deduction(deduction):
+    return {
+        'id': deduction.id,
+        'shares_deducted': deduction.shares_deducted,
+        'reason': deduction.reason,
+        'deducted_by': deduction.deducted_by.username,
+        'created_at': deduction.created_at.isoformat(),
+    }
+
+DASHBOARD_SECTIONS = {
+    'applications': (MembershipApplication.objects.all(), serialize_application),
+    'claims': (Claim.objects.all(), serialize_claim),
+    'payments': (MembershipPayment.objects.all(), serialize_payment),
+    'shares': (SharePurchase.objects.all(), serialize_share),
+    'share_deductions': (ShareDeduction.objects.select_related('deducted_by'), serialize_deduction),
+}
+
+def dashboard_section(name, user, cursor=None):
+    """Newest rows of one list (after cursor) and the cursor for the rows after them"""
+    queryset, serialize = DASHBOARD_SECTIONS[name]
+    queryset = queryset.filter(user=user)
+    if cursor:
+        created_at, pk = decode_cursor(cursor)
+        queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
     
-    # Get or create user profile
-    profile, created = UserProfile.objects.get_or_create(user=request.user)
+    # Fetch one extra row to know whether there are more
+    size = getattr(settings, 'DASHBOARD_SECTION_SIZE', 10)
+    rows = list(queryset.order_by('-created_at', '-id')[:size + 1])
+    next_cursor = None
+    if len(rows) > size:
+        rows = rows[:size]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return [serialize(row) for row in rows], next_cursor
+
+def dashboard_stats(user):
+    """Counters and totals, one conditional aggregate query per table"""
+    applications = MembershipApplication.objects.filter(user=user).aggregate(
+        total_applications=Count('id'),
+        approved_applications=Count('id', filter=Q(status='approved')),
+    )
+    claims = Claim.objects.filter(user=user).aggregate(
+        total_claims=Count('id'),
+        approved_claims=Count('id', filter=Q(status='approved')),
+        pending_claims=Count('id', filter=Q(status='pending')),
+    )
+    payments = MembershipPayment.objects.filter(user=user).aggregate(
+        total_payments=Count('id'),
+        pending_payments=Count('id', filter=Q(status='pending')),
+        # Summed as DECIMAL in SQL, not float in Python
+        total_paid=Coalesce(Sum('amount', filter=Q(status='approved')), Value(Decimal('0.00')),
+                            output_field=DecimalField(max_digits=12, decimal_places=2)),
+    )
+    shares = SharePurchase.objects.filter(user=user).aggregate(total_shares=Count('id'))
     
-    # Get all user data with detailed information
-    applications = MembershipApplication.objects.filter(user=request.user).order_by('-created_at')
-    claims = Claim.objects.filter(user=request.user).order_by('-created_at')
-    payments = MembershipPayment.objects.filter(user=request.user).order_by('-created_at')
-    shares = SharePurchase.objects.filter(user=request.user).order_by('-created_at')
+    payments['total_paid'] = str(payments['total_paid'])
+    return {**applications, **claims, **payments, **shares}
+
+def build_dashboard(user):
+    profile, created = UserProfile.objects.get_or_create(user=user)
     
-    # Calculate current shares (purchases - deductions)
-    total_shares_purchased = sum(share.shares_requested for share in shares if share.status == 'approved')
-    share_deductions = ShareDeduction.objects.filter(user=request.user).aggregate(
-        total_deducted=models.Sum('shares_deducted')
-    )['total_deducted'] or 0
-    current_shares = total_shares_purchased - share_deductions
+    # Current shares from the share ledger (latest snapshot + recent entries)
+    share_totals = share_summary(user.id)
     
-    return JsonResponse({
+    sections, next_cursors = {}, {}
+    for name in DASHBOARD_SECTIONS:
+        sections[name], next_cursors[name] = dashboard_section(name, user)
+    
+    return {
         'user': {
-            'id': request.user.id,
-            'username': request.user.username,
-            'email': request.user.email,
-            'first_name': request.user.first_name,
-            'last_name': request.user.last_name,
-            'date_joined': request.user.date_joined.isoformat(),
+            'id': user.id,
+            'username': user.username,
+            'email': user.email,
+            'first_name': user.first_name,
+            'last_name': user.last_name,
+            'date_joined': user.date_joined.isoformat(),
         },
         'profile': {
             'membership_type': profile.membership_type,
             'membership_status': profile.membership_status,
-            'shares_owned': current_shares,
+            'shares_owned': share_totals['balance'],
             'phone': profile.phone,
         },
-        'applications': [{
-            'id': app.id,
-            'membership_type': app.membership_type,
-            'status': app.status,
-            'full_name': app.full_name,
-            'email': app.email,
-            'phone': app.phone,
-            'created_at': app.created_at.isoformat(),
-            'admin_notes': app.admin_notes,
-            'can_edit': app.status == 'pending',  # Only pending applications can be edited
-        } for app in applications],
-        'claims': [{
-            'id': claim.id,
-            'title': claim.title,
-            'status': claim.status,
-            'amount_requested': str(claim.amount_requested),
-            'amount_approved': str(claim.amount_approved) if claim.amount_approved else None,
-            'created_at': claim.created_at.isoformat(),
-            'admin_response': claim.admin_response,
-        } for claim in claims],
-        'payments': [{
-            'id': payment.id,
-            'payment_type': payment.payment_type,
-            'amount': str(payment.amount),
-            'payment_method': payment.payment_method,
-            'status': payment.status,
-            'created_at': payment.created_at.isoformat(),
-            'admin_notes': payment.admin_notes,
-            'can_print_receipt': payment.status == 'approved',
-        } for payment in payments],
-        'shares': [{
-            'id': share.id,
-            'shares_requested': share.shares_requested,
-            'amount': str(share.amount),
-            'status': share.status,
-            'created_at': share.created_at.isoformat(),
-        } for share in shares],
-        'share_deductions': [{
-            'id': deduction.id,
-            'shares_deducted': deduction.shares_deducted,
-            'reason': deduction.reason,
-            'deducted_by': deduction.deducted_by.username,
-            'created_at': deduction.created_at.isoformat(),
-        } for deduction in ShareDeduction.objects.filter(user=request.user)],
+        **sections,
+        'next_cursors': next_cursors,
         'stats': {
-            'total_applications': applications.count(),
-            'approved_applications': applications.filter(status='approved').count(),
-            'total_claims': claims.count(),
-            'approved_claims': claims.filter(status='approved').count(),
-            'total_payments': payments.count(),
-            'total_paid': sum(float(p.amount) for p in payments if p.status == 'approved'),
-            'current_shares': current_shares,
-            'total_shares_purchased': total_shares_purchased,
-            'total_shares_deducted': share_deductions,
+            **dashboard_stats(user),
+            'current_shares': share_totals['balance'],
+            'total_shares_purchased': share_totals['total_purchased'],
+            'total_shares_deducted': share_totals['total_deducted'],
         }
-    })
+    }
+
+@csrf_exempt
+def get_user_dashboard(request):
+    if not request.user.is_authenticated:
+        return JsonResponse({'error': 'Authentication required'}, status=401)
+    
+    # ?section=<name>&cursor=<cursor> pages through one list
+    section = request.GET.get('section')
+    if section:
+        if section not in DASHBOARD_SECTIONS:
+            return JsonResponse({'error': f'Unknown section: {section}'}, status=400)
+        try:
+            rows, next_cursor = dashboard_section(section, request.user, request.GET.get('cursor'))
+        except InvalidCursor:
+            return JsonResponse({'error': 'Invalid cursor'}, status=400)
+        return JsonResponse({section: rows, 'next_cursor': next_cursor})
+    
+    # Cached per member (users/snapshots.py); ?consistency=strict right after a submission
+    payload, state = dashboard_snapshot(request.user, strict=request.GET.get('consistency') == 'strict')
+    response = JsonResponse(payload)
+    response['X-Dashboard-Snapshot'] = state  # fresh, stale or rebuilt
+    return response
+'''
+
+DASHBOARD_SNAPSHOTS = '''
+# users/snapshots.py - Create this file
+#
+# Members open the dashboard far more often than their data changes, so each
+# member's built dashboard is kept in the cache next to a version number. A
+# request reads both with one get_many:
+#
+#   snapshot version == current version        -> served as is ('fresh')
+#   older, data changed < DASHBOARD_STALE_SECONDS
+#   ago and the request isn't strict           -> served, rebuild queued ('stale')
+#   otherwise                                  -> built inline ('rebuilt')
+#
+# Saving or deleting anything shown on the dashboard sets a new version after
+# commit and queues a rebuild on a daemon thread, so the next read normally
+# finds a fresh snapshot. Only save() and delete() are seen: code that changes
+# these rows with QuerySet.update() or bulk_create() must call
+# invalidate_dashboard(user_ids) - shares.ledger does for its bulk helpers.
+
+import logging
+import os
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import close_old_connections, transaction
+from django.db.models.signals import post_delete, post_save
+
+from applications.models import MembershipApplication
+from claims.models import Claim
+from payments.models import MembershipPayment, SharePurchase
+from response_cache.versions import version_key
+from shares.models import ShareLedgerEntry
+from users.models import ShareDeduction, UserProfile
+
+logger = logging.getLogger(__name__)
+
+# Ledger entries change the share balance without saving UserProfile
+DASHBOARD_MODELS = [MembershipApplication, MembershipPayment, Claim, SharePurchase,
+                    ShareDeduction, UserProfile, ShareLedgerEntry]
+
+def dashboard_setting(name, default):
+    return getattr(settings, name, default)
+
+def snapshot_key(user_id):
+    return f'dashboard:{user_id}'
+
+def new_version():
+    # Microseconds since the epoch, so the version also says when the data changed
+    return time.time_ns() // 1000
+
+def current_version(user_id, found):
+    key = version_key('dashboard', user_id)
+    version = found.get(key)
+    if version is None:  # Never written or evicted
+        cache.add(key, new_version(), None)
+        version = cache.get(key)
+    return version
+
+def store_snapshot(user, version):
+    from .views import build_dashboard
+    payload = build_dashboard(user)
+    cache.set(snapshot_key(user.id), {'version': version, 'payload': payload},
+              dashboard_setting('DASHBOARD_SNAPSHOT_TIMEOUT', 24 * 3600))
+    return payload
+
+def dashboard_snapshot(user, strict=False):
+    """(payload, state) for get_user_dashboard"""
+    found = cache.get_many([version_key('dashboard', user.id), snapshot_key(user.id)])
+    version = current_version(user.id, found)
+    snapshot = found.get(snapshot_key(user.id))
+    
+    if snapshot is not None and version is not None:
+        if snapshot['version'] == version:
+            return snapshot['payload'], 'fresh'
+        changed_ago = time.time() - version / 1000000
+        if not strict and changed_ago <= dashboard_setting('DASHBOARD_STALE_SECONDS', 60):
+            rebuilder.submit(user.id)  # In case the queued rebuild was dropped
+            return snapshot['payload'], 'stale'
+    
+    return store_snapshot(user, version), 'rebuilt'
+
+def rebuild_snapshot(user_id):
+    found = cache.get_many([version_key('dashboard', user_id), snapshot_key(user_id)])
+    version = current_version(user_id, found)
+    snapshot = found.get(snapshot_key(user_id))
+    if snapshot is not None and snapshot['version'] == version:
+        return  # A reader already rebuilt it
+    user = User.objects.filter(id=user_id).first()
+    if user is not None:
+        store_snapshot(user, version)
+
+
+class SnapshotRebuilder:
+    """Daemon thread rebuilding snapshots; each member is queued at most once"""
+    
+    def __init__(self):
+        self.queue = queue.Queue(maxsize=dashboard_setting('DASHBOARD_REBUILD_QUEUE_SIZE', 1000))
+        self.pending = set()
+        self.lock = threading.Lock()
+        self.thread = None
+        self.pid = None
+    
+    def submit(self, user_id):
+        # Tests set DASHBOARD_SNAPSHOT_SYNC = True to rebuild inline
+        if dashboard_setting('DASHBOARD_SNAPSHOT_SYNC', False):
+            rebuild_snapshot(user_id)
+            return
+        
+        self.ensure_started()
+        with self.lock:
+            if user_id in self.pending:
+                return
+            self.pending.add(user_id)
+        try:
+            self.queue.put_nowait(user_id)
+        except queue.Full:
+            # Readers rebuild inline once the stale window has passed
+            with self.lock:
+                self.pending.discard(user_id)
+    
+    def ensure_started(self):
+        # Start lazily and again after a fork, since threads do not survive it
+        if self.thread is not None and self.pid == os.getpid() and self.thread.is_alive():
+            return
+        with self.lock:
+            if self.thread is not None and self.pid == os.getpid() and self.thread.is_alive():
+                return
+            if self.pid != os.getpid():
+                self.queue = queue.Queue(maxsize=self.queue.maxsize)
+                self.pending = set()
+            self.pid = os.getpid()
+            self.thread = threading.Thread(target=self.run, name='dashboard-snapshots', daemon=True)
+            self.thread.start()
+    
+    def run(self):
+        while True:
+            user_id = self.queue.get()
+            # Dropped from pending before building, so a write during the build queues again
+            with self.lock:
+                self.pending.discard(user_id)
+            close_old_connections()
+            try:
+                rebuild_snapshot(user_id)
+            except Exception:
+                logger.exception('Failed to rebuild dashboard snapshot for user %s', user_id)
+            finally:
+                close_old_connections()
+
+
+rebuilder = SnapshotRebuilder()
+
+def invalidate_dashboard(user_ids):
+    """Mark the dashboards of user_ids changed once the transaction commits"""
+    user_ids = set(user_ids)
+    if not user_ids:
+        return
+    
+    def changed():
+        version = new_version()
+        cache.set_many({version_key('dashboard', user_id): version for user_id in user_ids}, None)
+        for user_id in user_ids:
+            rebuilder.submit(user_id)
+    # After commit, so the rebuild reads the new rows
+    transaction.on_commit(changed)
+
+def dashboard_row_changed(sender, instance, **kwargs):
+    invalidate_dashboard([instance.user_id])
+
+def dashboard_user_changed(sender, instance, update_fields=None, **kwargs):
+    # Every login saves last_login, which the dashboard doesn't show
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    invalidate_dashboard([instance.id])
+
+def connect_dashboard_signals():
+    for model in DASHBOARD_MODELS:
+        post_save.connect(dashboard_row_changed, sender=model, weak=False)
+        post_delete.connect(dashboard_row_changed, sender=model, weak=False)
+    post_save.connect(dashboard_user_changed, sender=User, weak=False)
+
+# users/apps.py - Connect the signals
+from django.apps import AppConfig
+
+class UsersConfig(AppConfig):
+    name = 'users'
+    
+    def ready(self):
+        from .authentication import connect_token_cache_signals  # backend_fixes.py section 11
+        from .snapshots import connect_dashboard_signals
+        connect_dashboard_signals()
+        connect_token_cache_signals()
+
+# users/views.py - Add this import
+from .snapshots import dashboard_snapshot
+
+# settings.py - Add these settings (needs the shared CACHES from RESPONSE_CACHE_SYSTEM.py)
+DASHBOARD_STALE_SECONDS = 60            # Serve the old dashboard this long after a change
+DASHBOARD_SNAPSHOT_TIMEOUT = 24 * 3600  # Snapshots of inactive members age out
+DASHBOARD_REBUILD_QUEUE_SIZE = 1000
+'''
+
+DASHBOARD_QUERY_COUNT_TESTS = '''
+# users/tests.py - The dashboard must cost the same however long the history
+
+from decimal import Decimal
+
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from applications.models import MembershipApplication
+from claims.models import Claim
+from payments.models import MembershipPayment, SharePurchase
+from shares.ledger import post_entry
+
+from .models import ShareDeduction, UserProfile
+from .snapshots import rebuilder
+
+
+# DummyCache: every request builds the dashboard, which is what is counted here
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}})
+class DashboardQueryCountTests(TestCase):
+    # Session + user, profile, share ledger (2), 4 stats aggregates, 5 lists
+    DASHBOARD_QUERIES = 14
+    SECTION_QUERIES = 3
+
+    def setUp(self):
+        self.user = User.objects.create_user('member', 'member@example.com', 'pass')
+        self.admin = User.objects.create_superuser('admin', 'admin@example.com', 'pass')
+        UserProfile.objects.get_or_create(user=self.user)  # So no request pays for the insert
+        self.client.force_login(self.user)
+
+    def create_rows(self, count):
+        for i in range(count):
+            MembershipApplication.objects.create(
+                user=self.user, membership_type='single', full_name=f'Member {i}',
+                email='member@example.com', phone='555-0100', status='approved',
+            )
+            MembershipPayment.objects.create(
+                user=self.user, payment_type='activation_fee', amount=Decimal('50.10'),
+                payment_method='paypal', status='approved',
+            )
+            Claim.objects.create(
+                user=self.user, title='Claim', description='...', amount_requested=Decimal('100.00'),
+            )
+            SharePurchase.objects.create(
+                user=self.user, shares_requested=1, amount=Decimal('100.00'), payment_method='paypal',
+            )
+            ShareDeduction.objects.create(
+                user=self.user, shares_deducted=1, reason='...', deducted_by=self.admin,
+            )
+
+    def test_constant_queries(self):
+        for count in (3, 30):
+            self.create_rows(count)
+            with self.assertNumQueries(self.DASHBOARD_QUERIES):
+                response = self.client.get(reverse('get_user_dashboard'))
+            self.assertEqual(response.status_code, 200)
+
+    @override_settings(DASHBOARD_SECTION_SIZE=10)
+    def test_stats_and_sections(self):
+        self.create_rows(30)
+        data = self.client.get(reverse('get_user_dashboard')).json()
+        self.assertEqual(data['stats']['total_payments'], 30)
+        self.assertEqual(data['stats']['approved_applications'], 30)
+        self.assertEqual(data['stats']['total_paid'], '1503.00')
+        self.assertEqual(len(data['payments']), 10)
+
+        # Page through the rest of one list
+        seen = [payment['id'] for payment in data['payments']]
+        cursor = data['next_cursors']['payments']
+        while cursor:
+            with self.assertNumQueries(self.SECTION_QUERIES):
+                page = self.client.get(reverse('get_user_dashboard'),
+                                       {'section': 'payments', 'cursor': cursor}).json()
+            seen += [payment['id'] for payment in page['payments']]
+            cursor = page['next_cursor']
+        self.assertEqual(len(seen), 30)
+        self.assertEqual(len(set(seen)), 30)
+
+    def test_bad_section_and_cursor(self):
+        url = reverse('get_user_dashboard')
+        self.assertEqual(self.client.get(url, {'section': 'passwords'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'section': 'claims', 'cursor': '!!'}).status_code, 400)
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    DASHBOARD_SNAPSHOT_SYNC=True,
+)
+class DashboardSnapshotTests(TestCase):
+    def setUp(self):
+        cache.clear()  # locmem outlives the test transaction
+        self.user = User.objects.create_user('member', 'member@example.com', 'pass')
+        UserProfile.objects.get_or_create(user=self.user)
+        self.client.force_login(self.user)
+        self.url = reverse('get_user_dashboard')
+
+    def add_claim(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Claim.objects.create(
+                user=self.user, title='Claim', description='...', amount_requested=Decimal('100.00'),
+            )
+
+    def test_cached_read_is_one_cache_hit(self):
+        self.assertEqual(self.client.get(self.url)['X-Dashboard-Snapshot'], 'rebuilt')
+        # Session + user only
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+        self.assertEqual(response['X-Dashboard-Snapshot'], 'fresh')
+
+    def test_write_rebuilds_snapshot(self):
+        self.client.get(self.url)
+        self.add_claim()
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Dashboard-Snapshot'], 'fresh')
+        self.assertEqual(response.json()['stats']['total_claims'], 1)
+
+    def test_stale_then_strict(self):
+        self.client.get(self.url)
+        with mock.patch.object(rebuilder, 'submit'):  # Rebuild never finishes
+            self.add_claim()
+            response = self.client.get(self.url)
+            self.assertEqual(response['X-Dashboard-Snapshot'], 'stale')
+            self.assertEqual(response.json()['stats']['total_claims'], 0)
+
+            response = self.client.get(self.url, {'consistency': 'strict'})
+            self.assertEqual(response['X-Dashboard-Snapshot'], 'rebuilt')
+            self.assertEqual(response.json()['stats']['total_claims'], 1)
+
+    def test_bulk_deduction_rebuilds_snapshot(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            post_entry(self.user, 'purchase', 5)
+        self.assertEqual(self.client.get(self.url).json()['stats']['current_shares'], 5)
+
+        # deduct_shares_all changes shares with update() and bulk_create(), no signals
+        admin = APIClient()
+        admin.force_authenticate(User.objects.create_superuser('admin', 'admin@example.com', 'pass'))
+        with self.captureOnCommitCallbacks(execute=True):
+            response = admin.post('/api/admin/contact/deduct_shares_all/', {'amount': 2, 'reason': 'Test'})
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Dashboard-Snapshot'], 'fresh')
+        self.assertEqual(response.json()['stats']['current_shares'], 3)
+        self.assertEqual(response.json()['stats']['total_shares_deducted'], 2)
 '''
 
 # ===== 3. APPLICATION EDITING FUNCTIONALITY =====
@@ -275,10 +709,87 @@ class ShareDeduction(models.Model):
 RECEIPT_PRINTING = '''
 # payments/views.py - Receipt generation
 
-from django.http import HttpResponse
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+from django.conf import settings
+from django.http import FileResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter
-import io
+
+# Rendered receipts live in RECEIPT_CACHE_DIR/<payment_id>/<hash>.pdf, outside
+# MEDIA_ROOT so they are only handed out by this view and not at MEDIA_URL
+def receipt_cache_dir():
+    return getattr(settings, 'RECEIPT_CACHE_DIR',
+                   os.path.join(settings.BASE_DIR, 'private', 'receipt_cache'))
+
+def receipt_lines(payment, user):
+    """Everything printed on the receipt - the cache key is a hash of this"""
+    return [
+        "PAMOJA MEMBERSHIP RECEIPT",
+        f"Receipt #: {payment.id}",
+        f"Date: {payment.created_at.strftime('%B %d, %Y')}",
+        f"Member: {user.get_full_name() or user.username}",
+        f"Payment Type: {payment.get_payment_type_display()}",
+        f"Amount: ${payment.amount}",
+        f"Method: {payment.payment_method}",
+        f"Status: {payment.status.upper()}",
+    ]
+
+def render_receipt(lines, path):
+    """Render the receipt PDF to path, replacing it atomically"""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as tmp:
+            p = canvas.Canvas(tmp, pagesize=letter)
+            
+            p.drawString(100, 750, lines[0])
+            y_position = 720
+            for line in lines[1:]:
+                p.drawString(100, y_position, line)
+                y_position -= 20
+            
+            p.showPage()
+            p.save()
+        os.replace(tmp_path, path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+    
+    # Drop receipts rendered from older versions of this payment, but only once
+    # they are old enough that no request can still be about to open them
+    cutoff = time.time() - getattr(settings, 'RECEIPT_STALE_SECONDS', 3600)
+    for name in os.listdir(directory):
+        other = os.path.join(directory, name)
+        if not name.endswith('.pdf') or other == path:
+            continue
+        try:
+            if os.stat(other).st_mtime < cutoff:
+                os.unlink(other)
+        except FileNotFoundError:
+            pass
+
+def cached_receipt(payment, user):
+    """Return (open file, etag), rendering the receipt only if its content changed"""
+    lines = receipt_lines(payment, user)
+    digest = hashlib.sha256(json.dumps(lines).encode('utf-8')).hexdigest()
+    path = os.path.join(receipt_cache_dir(), str(payment.id), f'{digest}.pdf')
+    
+    try:
+        receipt = open(path, 'rb')
+    except FileNotFoundError:
+        # Not rendered yet, or removed since; an open file survives a later unlink
+        render_receipt(lines, path)
+        receipt = open(path, 'rb')
+    return receipt, f'"{digest}"'
 
 @csrf_exempt
 def print_payment_receipt(request, payment_id):
@@ -291,27 +802,21 @@ def print_payment_receipt(request, payment_id):
         if payment.status != 'approved':
             return JsonResponse({'error': 'Receipt only available for approved payments'}, status=400)
         
-        # Create PDF receipt
-        buffer = io.BytesIO()
-        p = canvas.Canvas(buffer, pagesize=letter)
+        receipt, etag = cached_receipt(payment, request.user)
+        last_modified = int(os.fstat(receipt.fileno()).st_mtime)
         
-        # Receipt content
-        p.drawString(100, 750, "PAMOJA MEMBERSHIP RECEIPT")
-        p.drawString(100, 720, f"Receipt #: {payment.id}")
-        p.drawString(100, 700, f"Date: {payment.created_at.strftime('%B %d, %Y')}")
-        p.drawString(100, 680, f"Member: {request.user.get_full_name() or request.user.username}")
-        p.drawString(100, 660, f"Payment Type: {payment.get_payment_type_display()}")
-        p.drawString(100, 640, f"Amount: ${payment.amount}")
-        p.drawString(100, 620, f"Method: {payment.payment_method}")
-        p.drawString(100, 600, f"Status: {payment.status.upper()}")
-        
-        p.showPage()
-        p.save()
-        
-        buffer.seek(0)
-        response = HttpResponse(buffer, content_type='application/pdf')
-        response['Content-Disposition'] = f'attachment; filename="receipt_{payment.id}.pdf"'
+        # If-None-Match / If-Modified-Since -> 304 without sending the file
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = FileResponse(receipt, as_attachment=True,
+                                    filename=f'receipt_{payment.id}.pdf',
+                                    content_type='application/pdf')
+        else:
+            receipt.close()
         
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        response['Cache-Control'] = 'private, no-cache'
         return response
         
     except MembershipPayment.DoesNotExist:
@@ -321,51 +826,100 @@ def print_payment_receipt(request, payment_id):
 # ===== 6. ADMIN PRINTING FUNCTIONALITY =====
 ADMIN_PRINTING = '''
 # admin_panel/views.py - Admin printing capabilities
+# For big tables use the background report jobs in REPORT_JOBS_SYSTEM.py,
+# which render these same reports outside the web worker.
 
-@csrf_exempt
-def print_all_applications(request):
-    if not request.user.is_staff:
-        return JsonResponse({'error': 'Admin access required'}, status=403)
-    
-    applications = MembershipApplication.objects.all().order_by('-created_at')
-    
-    # Generate PDF report
-    buffer = io.BytesIO()
-    p = canvas.Canvas(buffer, pagesize=letter)
+import tempfile
+
+from django.conf import settings
+from django.db.models import Sum
+from django.http import FileResponse
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+def report_chunk_size():
+    # Rows fetched per database round trip while drawing a report
+    return getattr(settings, 'REPORT_CHUNK_SIZE', 500)
+
+def draw_report(title, lines, pdf_file=None):
+    """Draw lines into a PDF spooled on disk and return the open file.
+
+    lines can be any iterable (e.g. a generator over queryset.iterator()),
+    so rows are streamed from the database in chunks rather than loaded at
+    once. reportlab's canvas still keeps every drawn page until save().
+    Pass pdf_file to draw into an already open file instead of a temp file.
+    """
+    pdf_file = pdf_file or tempfile.TemporaryFile()
+    p = canvas.Canvas(pdf_file, pagesize=letter)
     
     y_position = 750
-    p.drawString(100, y_position, "PAMOJA MEMBERSHIP APPLICATIONS REPORT")
+    p.drawString(100, y_position, title)
     y_position -= 30
     
-    for app in applications:
+    for line in lines:
         if y_position < 100:  # New page if needed
             p.showPage()
             y_position = 750
         
-        p.drawString(100, y_position, f"ID: {app.id} | {app.full_name} | {app.membership_type} | {app.status}")
+        p.drawString(100, y_position, line)
         y_position -= 20
     
     p.showPage()
     p.save()
     
-    buffer.seek(0)
-    response = HttpResponse(buffer, content_type='application/pdf')
-    response['Content-Disposition'] = 'attachment; filename="all_applications.pdf"'
+    pdf_file.seek(0)
+    return pdf_file
+
+def pdf_response(pdf_file, filename):
+    # FileResponse streams the file in blocks and closes it when done
+    return FileResponse(pdf_file, as_attachment=True, filename=filename,
+                        content_type='application/pdf')
+
+APPLICATIONS_REPORT_TITLE = "PAMOJA MEMBERSHIP APPLICATIONS REPORT"
+FINANCIAL_REPORT_TITLE = "PAMOJA FINANCIAL REPORT"
+
+def application_report_lines():
+    applications = (
+        MembershipApplication.objects
+        .order_by('-created_at')
+        .values_list('id', 'full_name', 'membership_type', 'status')
+        .iterator(chunk_size=report_chunk_size())
+    )
+    for app_id, full_name, membership_type, status in applications:
+        yield f"ID: {app_id} | {full_name} | {membership_type} | {status}"
+
+def financial_report_lines():
+    payments = MembershipPayment.objects.filter(status='approved')
+    total_revenue = payments.aggregate(total=Sum('amount'))['total'] or 0
+    yield f"Total revenue: ${total_revenue}"
     
-    return response
+    rows = (
+        payments
+        .order_by('-created_at')
+        .values_list('id', 'user__username', 'payment_type', 'amount', 'created_at')
+        .iterator(chunk_size=report_chunk_size())
+    )
+    for payment_id, username, payment_type, amount, created_at in rows:
+        yield (f"#{payment_id} | {created_at.strftime('%Y-%m-%d')} | {username} | "
+               f"{payment_type} | ${amount}")
 
 @csrf_exempt
-def print_financial_report(request):
+def print_all_applications(request):
     if not request.user.is_staff:
         return JsonResponse({'error': 'Admin access required'}, status=403)
     
-    payments = MembershipPayment.objects.filter(status='approved').order_by('-created_at')
-    total_revenue = sum(float(p.amount) for p in payments)
+    pdf_file = draw_report(APPLICATIONS_REPORT_TITLE, application_report_lines())
     
-    # Generate financial PDF report
-    # ... similar PDF generation logic
+    return pdf_response(pdf_file, 'all_applications.pdf')
+
+@csrf_exempt
+def print_financial_report(request):
+    if not request.user.is_staff:
+        return JsonResponse({'error': 'Admin access required'}, status=403)
     
-    return response
+    pdf_file = draw_report(FINANCIAL_REPORT_TITLE, financial_report_lines())
+    
+    return pdf_response(pdf_file, 'financial_report.pdf')
 '''
 
 # ===== 7. URL PATTERNS UPDATES =====
@@ -416,6 +970,7 @@ print("4. Application editing (pending only)")
 print("5. Share deduction tracking")
 print("6. Receipt printing (PDF)")
 print("7. Admin reporting and printing")
-print("8. Email notifications")
+print("8. Email notifications (queued via EMAIL_OUTBOX_SYSTEM.py)")
 print("9. Current shares calculation")
-print("10. Enhanced dashboard with all user data")
\ No newline at end of file
+print("10. Enhanced dashboard with all user data (fixed query count, paged lists)")
+print("    cached per member, rebuilt in the background on write (DASHBOARD_SNAPSHOTS)")
\ No newline at end of file
@@ -105,12 +105,14 @@ class SharePurchase(models.Model):
 
 # ===== VIEWS.PY - PAYMENTS APP =====
 PAYMENTS_VIEWS = '''
+from django.db import transaction
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.contrib.auth.decorators import login_required
 from django.utils.decorators import method_decorator
 from django.views import View
+from uploads.chunked import upload_or_file
 import json
 
 @csrf_exempt
@@ -139,13 +141,15 @@ def create_payment(request):
         return JsonResponse({'error': 'Authentication required'}, status=401)
     
     try:
-        payment = MembershipPayment.objects.create(
-            user=request.user,
-            payment_type=request.POST.get('payment_type'),
-            amount=request.POST.get('amount'),
-            payment_method=request.POST.get('payment_method'),
-            payment_proof=request.FILES.get('payment_proof'),
-        )
+        # The proof may be a multipart file or a chunked upload token
+        with transaction.atomic():
+            payment = MembershipPayment.objects.create(
+                user=request.user,
+                payment_type=request.POST.get('payment_type'),
+                amount=request.POST.get('amount'),
+                payment_method=request.POST.get('payment_method'),
+                payment_proof=upload_or_file(request, 'payment_proof'),
+            )
         
         return JsonResponse({
             'success': True,
@@ -162,13 +166,15 @@ def submit_activation_payment(request):
         return JsonResponse({'error': 'Authentication required'}, status=401)
     
     try:
-        payment = MembershipPayment.objects.create(
-            user=request.user,
-            payment_type='activation_fee',
-            amount=request.POST.get('amount'),
-            payment_method=request.POST.get('payment_method'),
-            payment_proof=request.FILES.get('payment_proof'),
-        )
+        # The proof may be a multipart file or a chunked upload token
+        with transaction.atomic():
+            payment = MembershipPayment.objects.create(
+                user=request.user,
+                payment_type='activation_fee',
+                amount=request.POST.get('amount'),
+                payment_method=request.POST.get('payment_method'),
+                payment_proof=upload_or_file(request, 'payment_proof'),
+            )
         
         return JsonResponse({
             'success': True,
@@ -233,70 +239,9 @@ def submit_claim(request):
 
 # ===== VIEWS.PY - USERS APP =====
 USERS_VIEWS = '''
-@csrf_exempt
-@require_http_methods(["GET"])
-def get_user_dashboard(request):
-    if not request.user.is_authenticated:
-        return JsonResponse({'error': 'Authentication required'}, status=401)
-    
-    # Get or create user profile
-    profile, created = UserProfile.objects.get_or_create(user=request.user)
-    
-    # Get user data
-    applications = MembershipApplication.objects.filter(user=request.user).order_by('-created_at')
-    claims = Claim.objects.filter(user=request.user).order_by('-created_at')
-    payments = MembershipPayment.objects.filter(user=request.user).order_by('-created_at')
-    shares = SharePurchase.objects.filter(user=request.user).order_by('-created_at')
-    
-    return JsonResponse({
-        'user': {
-            'id': request.user.id,
-            'username': request.user.username,
-            'email': request.user.email,
-            'first_name': request.user.first_name,
-            'last_name': request.user.last_name,
-        },
-        'profile': {
-            'membership_type': profile.membership_type,
-            'membership_status': profile.membership_status,
-            'shares_owned': profile.shares_owned,
-            'phone': profile.phone,
-        },
-        'applications': [{
-            'id': app.id,
-            'membership_type': app.membership_type,
-            'status': app.status,
-            'created_at': app.created_at.isoformat(),
-            'admin_notes': app.admin_notes,
-        } for app in applications],
-        'claims': [{
-            'id': claim.id,
-            'title': claim.title,
-            'status': claim.status,
-            'amount_requested': str(claim.amount_requested),
-            'created_at': claim.created_at.isoformat(),
-        } for claim in claims],
-        'payments': [{
-            'id': payment.id,
-            'payment_type': payment.payment_type,
-            'amount': str(payment.amount),
-            'status': payment.status,
-            'created_at': payment.created_at.isoformat(),
-        } for payment in payments],
-        'shares': [{
-            'id': share.id,
-            'shares_requested': share.shares_requested,
-            'amount': str(share.amount),
-            'status': share.status,
-            'created_at': share.created_at.isoformat(),
-        } for share in shares],
-        'stats': {
-            'total_applications': applications.count(),
-            'total_claims': claims.count(),
-            'total_payments': payments.count(),
-            'total_shares': shares.count(),
-        }
-    })
+# get_user_dashboard: use DASHBOARD_ENHANCEMENTS from BACKEND_ENHANCEMENTS_COMPLETE.py.
+# It returns the same fields, computes the stats with one aggregate query per
+# table and caps each list with a cursor for older rows.
 '''
 
 # ===== URL PATTERNS =====
@@ -0,0 +1,361 @@
+# CHUNKED UPLOAD SYSTEM - RESUMABLE UPLOADS FOR ID DOCUMENTS AND PAYMENT EVIDENCE
+
+# id_document, spouse_id_document, evidence_file and payment_proof used to
+# arrive in one multipart POST. Now the frontend can open an upload session,
+# send the file in chunks that are streamed straight to disk, resume from the
+# last acknowledged offset after a dropped connection, and then pass the
+# session token to submit_application or the payment views instead of the file.
+# Plain multipart uploads keep working.
+
+# ===== 1. UPLOAD SESSION MODEL =====
+UPLOAD_MODEL = '''
+# uploads/models.py - Add this model
+
+import uuid
+
+from django.contrib.auth.models import User
+from django.db import models
+
+class UploadSession(models.Model):
+    PURPOSE_CHOICES = [
+        ('id_document', 'ID Document'),
+        ('spouse_id_document', 'Spouse ID Document'),
+        ('evidence_file', 'Payment Evidence'),
+        ('payment_proof', 'Payment Proof'),
+    ]
+
+    STATUS_CHOICES = [
+        ('uploading', 'Uploading'),
+        ('complete', 'Complete'),
+        ('consumed', 'Consumed'),  # Attached to an application or payment
+    ]
+
+    token = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='upload_sessions')
+    purpose = models.CharField(max_length=30, choices=PURPOSE_CHOICES)
+    filename = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=100, blank=True)
+    size = models.BigIntegerField()
+    received = models.BigIntegerField(default=0)
+    sha256 = models.CharField(max_length=64, blank=True)  # Whole file, set on completion
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='uploading')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'updated_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} {self.purpose} {self.received}/{self.size}"
+'''
+
+# ===== 2. UPLOAD FUNCTIONS =====
+UPLOAD_FUNCTIONS = '''
+# uploads/chunked.py - Create this file
+
+import hashlib
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+
+from .models import UploadSession
+
+BLOCK_SIZE = 64 * 1024
+
+class InvalidUpload(ValueError):
+    pass
+
+class OffsetMismatch(InvalidUpload):
+    def __init__(self, expected):
+        super().__init__(f'Upload-Offset must be {expected}')
+        self.expected = expected
+
+def upload_setting(name, default):
+    return getattr(settings, name, default)
+
+def upload_dir():
+    path = upload_setting('CHUNKED_UPLOAD_DIR', os.path.join(settings.MEDIA_ROOT, 'uploads_tmp'))
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def part_path(session):
+    return os.path.join(upload_dir(), f'{session.token}.part')
+
+def start_upload(user, purpose, filename, size, content_type=''):
+    if purpose not in dict(UploadSession.PURPOSE_CHOICES):
+        raise InvalidUpload(f'Unknown purpose: {purpose}')
+    try:
+        size = int(size)
+    except (TypeError, ValueError):
+        raise InvalidUpload('size must be a number of bytes')
+    max_size = upload_setting('CHUNKED_UPLOAD_MAX_SIZE', 50 * 1024 * 1024)
+    if size <= 0 or size > max_size:
+        raise InvalidUpload(f'size must be between 1 and {max_size} bytes')
+    if not filename:
+        raise InvalidUpload('filename is required')
+
+    session = UploadSession.objects.create(
+        user=user, purpose=purpose, filename=os.path.basename(filename)[:255],
+        content_type=content_type or '', size=size,
+    )
+    open(part_path(session), 'wb').close()
+    return session
+
+def append_chunk(session, offset, stream, length, chunk_sha256=None):
+    """Stream length bytes from stream onto the end of the part file.
+
+    offset must equal the bytes already received, so a retried or duplicated
+    chunk is rejected with the offset to resume from. The chunk is first
+    streamed and hashed into its own temp file; if it is short, or the client
+    sent a SHA-256 that doesn't match, it is discarded without touching the
+    part file. It is then appended with the session row locked, so two
+    requests for the same offset (a retry racing a slow original) can't both
+    write, and the part file only ever holds acknowledged bytes.
+    """
+    if session.status != 'uploading':
+        raise InvalidUpload(f'Upload is {session.status}')
+    if offset != session.received:
+        raise OffsetMismatch(session.received)
+    max_chunk = upload_setting('CHUNKED_UPLOAD_MAX_CHUNK', 5 * 1024 * 1024)
+    if length <= 0 or length > max_chunk or offset + length > session.size:
+        raise InvalidUpload(f'Chunk must be 1-{max_chunk} bytes and end within the file')
+
+    fd, chunk_path = tempfile.mkstemp(dir=upload_dir(), prefix=f'{session.token}.', suffix='.chunk')
+    try:
+        digest = hashlib.sha256()
+        written = 0
+        with os.fdopen(fd, 'wb') as chunk:
+            while written < length:
+                block = stream.read(min(BLOCK_SIZE, length - written))
+                if not block:
+                    break
+                chunk.write(block)
+                digest.update(block)
+                written += len(block)
+        if written != length or (chunk_sha256 and chunk_sha256.lower() != digest.hexdigest()):
+            # Short or corrupted chunk - the client resends from offset
+            raise OffsetMismatch(offset)
+
+        with transaction.atomic():
+            locked = UploadSession.objects.select_for_update().get(id=session.id)
+            if locked.status != 'uploading':
+                raise InvalidUpload(f'Upload is {locked.status}')
+            if locked.received != offset:
+                raise OffsetMismatch(locked.received)  # Another request got there first
+
+            with open(part_path(locked), 'r+b') as part, open(chunk_path, 'rb') as chunk:
+                part.seek(offset)
+                shutil.copyfileobj(chunk, part, BLOCK_SIZE)
+                part.truncate(offset + length)
+
+            locked.received = offset + length
+            UploadSession.objects.filter(id=locked.id).update(
+                received=locked.received, updated_at=timezone.now()
+            )
+            if locked.received == locked.size:
+                finish_upload(locked)
+    finally:
+        os.unlink(chunk_path)
+    return locked
+
+def finish_upload(session):
+    """Hash the assembled file in one streaming pass and mark it complete"""
+    digest = hashlib.sha256()
+    with open(part_path(session), 'rb') as part:
+        for block in iter(lambda: part.read(BLOCK_SIZE), b''):
+            digest.update(block)
+    session.sha256 = digest.hexdigest()
+    session.status = 'complete'
+    session.save(update_fields=['sha256', 'status', 'updated_at'])
+
+def take_upload(user, token, purpose):
+    """Claim a completed upload for a FileField and return it as a File.
+
+    Call inside the transaction that saves the model, so a failed save puts
+    the upload back to complete and the member can submit again.
+    """
+    try:
+        session = UploadSession.objects.get(token=token, user=user, purpose=purpose)
+    except (UploadSession.DoesNotExist, ValidationError):
+        raise InvalidUpload(f'Unknown {purpose} upload')
+
+    claimed = UploadSession.objects.filter(id=session.id, status='complete').update(status='consumed')
+    if not claimed:
+        raise InvalidUpload(f'{purpose} upload is not complete')
+    upload = File(open(part_path(session), 'rb'), name=session.filename)
+    upload.sha256 = session.sha256  # Lets ContentAddressedStorage skip re-hashing
+    return upload
+
+def upload_or_file(request, field):
+    """request.FILES[field], or the chunked upload named by the <field>_upload token"""
+    if field in request.FILES:
+        return request.FILES[field]
+    token = request.POST.get(f'{field}_upload')
+    if not token:
+        return None
+    return take_upload(request.user, token, field)
+
+def expire_uploads():
+    """Delete part files of consumed uploads and of sessions abandoned too long"""
+    hours = upload_setting('CHUNKED_UPLOAD_EXPIRE_HOURS', 24)
+    cutoff = timezone.now() - timedelta(hours=hours)
+    expired = UploadSession.objects.filter(status='consumed') | UploadSession.objects.filter(updated_at__lt=cutoff)
+    removed = 0
+    for session in expired.iterator():
+        try:
+            os.unlink(part_path(session))
+        except FileNotFoundError:
+            pass
+        session.delete()
+        removed += 1
+    return removed
+'''
+
+# ===== 3. UPLOAD ENDPOINTS =====
+UPLOAD_ENDPOINTS = '''
+# uploads/views.py - Resumable upload endpoints
+#
+#   POST  /api/uploads/                {purpose, filename, size, content_type}
+#         -> {token, offset: 0, chunk_size}
+#   PATCH /api/uploads/<token>/        raw bytes, headers Upload-Offset and
+#         optional Upload-Checksum: sha256 <hex>  -> {offset, status, sha256}
+#   GET   /api/uploads/<token>/        -> {offset, size, status} to resume
+#
+# Then submit the form with id_document_upload=<token> (or spouse_id_document_upload,
+# evidence_file_upload, payment_proof_upload) instead of the file.
+
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from .chunked import InvalidUpload, OffsetMismatch, append_chunk, start_upload, upload_setting
+from .models import UploadSession
+
+def session_payload(session):
+    return {
+        'token': str(session.token),
+        'purpose': session.purpose,
+        'filename': session.filename,
+        'size': session.size,
+        'offset': session.received,
+        'status': session.status,
+        'sha256': session.sha256 or None,
+        'chunk_size': upload_setting('CHUNKED_UPLOAD_CHUNK_SIZE', 1024 * 1024),
+    }
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def create_upload(request):
+    try:
+        session = start_upload(
+            request.user,
+            request.data.get('purpose'),
+            request.data.get('filename'),
+            request.data.get('size'),
+            request.data.get('content_type', ''),
+        )
+    except InvalidUpload as e:
+        return Response({'error': str(e)}, status=400)
+    return Response(session_payload(session), status=201)
+
+@api_view(['GET', 'PATCH'])
+@permission_classes([IsAuthenticated])
+def upload_detail(request, token):
+    try:
+        session = UploadSession.objects.get(token=token, user=request.user)
+    except UploadSession.DoesNotExist:
+        return Response({'error': 'Upload not found'}, status=404)
+
+    if request.method == 'GET':
+        return Response(session_payload(session))
+
+    try:
+        offset = int(request.headers.get('Upload-Offset', ''))
+        length = int(request.headers.get('Content-Length', ''))
+    except ValueError:
+        return Response({'error': 'Upload-Offset and Content-Length headers are required'}, status=400)
+
+    checksum = request.headers.get('Upload-Checksum', '')
+    chunk_sha256 = checksum[len('sha256 '):] if checksum.startswith('sha256 ') else None
+
+    try:
+        # request.stream is the raw WSGI input; the body is never buffered
+        session = append_chunk(session, offset, request.stream, length, chunk_sha256)
+    except OffsetMismatch as e:
+        return Response({'error': str(e), 'offset': e.expected}, status=409)
+    except InvalidUpload as e:
+        return Response({'error': str(e)}, status=400)
+
+    return Response(session_payload(session))
+
+# uploads/urls.py
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('api/uploads/', views.create_upload, name='create_upload'),
+    path('api/uploads/<uuid:token>/', views.upload_detail, name='upload_detail'),
+]
+'''
+
+# ===== 4. EXPIRE UPLOADS COMMAND =====
+EXPIRE_UPLOADS_COMMAND = '''
+# uploads/management/commands/expire_uploads.py - Create this file
+# Schedule hourly on PythonAnywhere: python manage.py expire_uploads
+
+from django.core.management.base import BaseCommand
+
+from uploads.chunked import expire_uploads
+
+class Command(BaseCommand):
+    help = 'Remove consumed and abandoned chunked uploads'
+
+    def handle(self, *args, **options):
+        removed = expire_uploads()
+        self.stdout.write(self.style.SUCCESS(f'Removed {removed} upload sessions'))
+'''
+
+# ===== 5. UPLOAD SETTINGS =====
+UPLOAD_SETTINGS = '''
+# settings.py - Add these settings
+
+INSTALLED_APPS += ['uploads']
+
+CHUNKED_UPLOAD_DIR = os.path.join(MEDIA_ROOT, 'uploads_tmp')  # Not served by MEDIA_URL
+CHUNKED_UPLOAD_CHUNK_SIZE = 1024 * 1024        # Chunk size suggested to clients (1MB)
+CHUNKED_UPLOAD_MAX_CHUNK = 5 * 1024 * 1024     # Largest chunk accepted
+CHUNKED_UPLOAD_MAX_SIZE = 50 * 1024 * 1024     # Largest file accepted
+CHUNKED_UPLOAD_EXPIRE_HOURS = 24               # Abandoned sessions are deleted after this
+
+# CORS: let the browser send the resumable upload headers
+from corsheaders.defaults import default_headers
+CORS_ALLOW_HEADERS = list(default_headers) + ['upload-offset', 'upload-checksum']
+'''
+
+print("CHUNKED UPLOAD SYSTEM READY!")
+print("Add to your Django backend:")
+print("1. Create an uploads app: python manage.py startapp uploads")
+print("2. Add UPLOAD_MODEL to uploads/models.py")
+print("3. Create uploads/chunked.py from UPLOAD_FUNCTIONS")
+print("4. Add UPLOAD_ENDPOINTS to uploads/views.py and uploads/urls.py")
+print("5. Create the expire_uploads command and schedule it hourly")
+print("6. Add UPLOAD_SETTINGS to settings.py")
+print("7. Run: python manage.py makemigrations uploads")
+print("8. Run: python manage.py migrate")
+print("9. Reload PythonAnywhere web app")
+print("Frontend: chunkedUpload() in src/services/chunkedUpload.js returns the token to submit")
+print("")
+print("Features:")
+print("✅ Uploads resume from the last chunk after a dropped connection")
+print("✅ Chunks streamed to disk, never held in worker memory")
+print("✅ Per-chunk checksum and whole-file SHA-256")
+print("✅ submit_application and payment views accept upload tokens")
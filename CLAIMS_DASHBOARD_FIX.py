@@ -73,79 +73,8 @@ def get_user_claims(request):
     return JsonResponse({'claims': claims_data})
 
 # GET USER DASHBOARD DATA
-@csrf_exempt
-def get_user_dashboard(request):
-    if not request.user.is_authenticated:
-        return JsonResponse({'error': 'Authentication required'}, status=401)
-    
-    # Get user profile
-    profile, created = UserProfile.objects.get_or_create(user=request.user)
-    
-    # Get membership applications
-    applications = MembershipApplication.objects.filter(user=request.user).order_by('-created_at')
-    applications_data = [{
-        'id': app.id,
-        'membership_type': app.membership_type,
-        'status': app.status,
-        'created_at': app.created_at.isoformat(),
-        'admin_notes': app.admin_notes,
-    } for app in applications]
-    
-    # Get claims
-    claims = Claim.objects.filter(user=request.user).order_by('-created_at')
-    claims_data = [{
-        'id': claim.id,
-        'title': claim.title,
-        'status': claim.status,
-        'amount_requested': str(claim.amount_requested),
-        'created_at': claim.created_at.isoformat(),
-    } for claim in claims]
-    
-    # Get payments
-    payments = MembershipPayment.objects.filter(user=request.user).order_by('-created_at')
-    payments_data = [{
-        'id': payment.id,
-        'payment_type': payment.payment_type,
-        'amount': str(payment.amount),
-        'status': payment.status,
-        'created_at': payment.created_at.isoformat(),
-    } for payment in payments]
-    
-    # Get shares
-    shares = SharePurchase.objects.filter(user=request.user).order_by('-created_at')
-    shares_data = [{
-        'id': share.id,
-        'shares_requested': share.shares_requested,
-        'amount': str(share.amount),
-        'status': share.status,
-        'created_at': share.created_at.isoformat(),
-    } for share in shares]
-    
-    return JsonResponse({
-        'user': {
-            'id': request.user.id,
-            'username': request.user.username,
-            'email': request.user.email,
-            'first_name': request.user.first_name,
-            'last_name': request.user.last_name,
-        },
-        'profile': {
-            'membership_type': profile.membership_type,
-            'membership_status': profile.membership_status,
-            'shares_owned': profile.shares_owned,
-            'phone': profile.phone,
-        },
-        'applications': applications_data,
-        'claims': claims_data,
-        'payments': payments_data,
-        'shares': shares_data,
-        'stats': {
-            'total_applications': len(applications_data),
-            'total_claims': len(claims_data),
-            'total_payments': len(payments_data),
-            'total_shares': len(shares_data),
-        }
-    })
+# Use get_user_dashboard from DASHBOARD_ENHANCEMENTS in BACKEND_ENHANCEMENTS_COMPLETE.py:
+# same fields plus stats from a fixed number of queries and paged lists
 '''
 
 # ===== BACKEND - Add these URLs to urls.py =====
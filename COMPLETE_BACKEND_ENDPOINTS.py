@@ -219,39 +219,7 @@ CRITICAL_MISSING_VIEWS = '''
 # These views are MISSING and causing frontend errors:
 
 # 1. User Dashboard View (users/views.py)
-@csrf_exempt
-def get_user_dashboard(request):
-    if not request.user.is_authenticated:
-        return JsonResponse({'error': 'Authentication required'}, status=401)
-    
-    # Get user profile
-    profile, created = UserProfile.objects.get_or_create(user=request.user)
-    
-    # Get all user data
-    applications = MembershipApplication.objects.filter(user=request.user).order_by('-created_at')
-    claims = Claim.objects.filter(user=request.user).order_by('-created_at')
-    payments = MembershipPayment.objects.filter(user=request.user).order_by('-created_at')
-    shares = SharePurchase.objects.filter(user=request.user).order_by('-created_at')
-    
-    return JsonResponse({
-        'user': {
-            'id': request.user.id,
-            'username': request.user.username,
-            'email': request.user.email,
-            'first_name': request.user.first_name,
-            'last_name': request.user.last_name,
-        },
-        'profile': {
-            'membership_type': profile.membership_type,
-            'membership_status': profile.membership_status,
-            'shares_owned': profile.shares_owned,
-            'phone': profile.phone,
-        },
-        'applications': [serialize_application(app) for app in applications],
-        'claims': [serialize_claim(claim) for claim in claims],
-        'payments': [serialize_payment(payment) for payment in payments],
-        'shares': [serialize_share(share) for share in shares],
-    })
+# Use get_user_dashboard from DASHBOARD_ENHANCEMENTS in BACKEND_ENHANCEMENTS_COMPLETE.py
 
 # 2. Claims Submit View (claims/views.py)
 @csrf_exempt
@@ -6,8 +6,9 @@
 MODELS = '''
 from django.db import models
 from django.contrib.auth.models import User
-from django.core.mail import send_mail
+from django.db import transaction
 from django.conf import settings
+from notifications.outbox import queue_email
 
 class UserProfile(models.Model):
     MEMBERSHIP_TYPES = [
@@ -87,15 +88,17 @@ class MembershipApplication(models.Model):
     
     def save(self, *args, **kwargs):
         is_new = self.pk is None
-        super().save(*args, **kwargs)
-        
-        if is_new:
-            # Send email notification
-            self.send_application_email()
+        # Queued email commits (or rolls back) together with the application
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            
+            if is_new:
+                # Queue email notification
+                self.send_application_email()
     
     def send_application_email(self):
         subject = f'Membership Application Received - {self.membership_type.title()}'
-        message = f'''
+        message = f"""
         Dear {self.first_name},
         
         Your {self.membership_type} family membership application has been received.
@@ -107,8 +110,8 @@ class MembershipApplication(models.Model):
         3. Receive activation confirmation
         
         Thank you for applying to Pamoja!
-        '''
-        send_mail(subject, message, settings.DEFAULT_FROM_EMAIL, [self.email])
+        """
+        queue_email(subject, message, [self.email])
 
 class MembershipPayment(models.Model):
     PAYMENT_TYPES = [
@@ -426,7 +429,7 @@ print("")
 print("This will provide:")
 print("✅ Active/Inactive membership status")
 print("✅ Complete membership application flow")
-print("✅ Email notifications")
+print("✅ Email notifications (queued via EMAIL_OUTBOX_SYSTEM.py)")
 print("✅ Payment tracking")
 print("✅ Claims system with admin responses")
 print("✅ Shares purchase system")
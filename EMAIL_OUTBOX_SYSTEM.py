@@ -0,0 +1,350 @@
+# EMAIL OUTBOX SYSTEM - QUEUED EMAIL DELIVERY FOR PAMOJA
+
+# Approval, rejection, share deduction and application emails are no longer
+# sent inline with send_mail(). They are written to an EmailOutbox table in the
+# same transaction as the change they describe, and a worker delivers them over
+# one reused SMTP connection.
+
+# ===== 1. OUTBOX MODEL =====
+OUTBOX_MODEL = '''
+# notifications/models.py - Add this model
+
+from django.db import models
+from django.utils import timezone
+
+class EmailOutbox(models.Model):
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    html_body = models.TextField(blank=True)
+    from_email = models.CharField(max_length=255, blank=True)
+    recipients = models.JSONField(default=list)
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+
+    # Set when a worker claims the row, so two workers never send the same email
+    claim_token = models.UUIDField(null=True, blank=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.recipients)} ({self.status})"
+'''
+
+# ===== 2. OUTBOX QUEUE AND DELIVERY =====
+OUTBOX_QUEUE = '''
+# notifications/outbox.py - Create this file
+
+import time
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import EmailOutbox
+
+def outbox_setting(name, default):
+    return getattr(settings, name, default)
+
+def queue_email(subject, message, recipient_list, html_message=None, from_email=None):
+    """Queue an email for the outbox worker (same arguments as send_mail).
+
+    The row is written on the caller's database connection, so inside
+    transaction.atomic() (or with ATOMIC_REQUESTS) it commits or rolls back
+    together with the approval/rejection that triggered it.
+    """
+    recipients = [address for address in recipient_list if address]
+    if not recipients:
+        return None
+
+    return EmailOutbox.objects.create(
+        subject=subject[:255],
+        body=message,
+        html_body=html_message or '',
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        recipients=recipients,
+    )
+
+def queue_emails(messages, batch_size=500):
+    """Queue many emails with chunked bulk_create (for bulk admin actions).
+
+    messages is an iterable of (subject, message, recipient_list, html_message)
+    tuples - the same arguments queue_email() takes. Returns the number queued.
+    """
+    from_email = settings.DEFAULT_FROM_EMAIL
+    queued = 0
+    batch = []
+
+    for subject, message, recipient_list, html_message in messages:
+        recipients = [address for address in recipient_list if address]
+        if not recipients:
+            continue
+        batch.append(EmailOutbox(
+            subject=subject[:255],
+            body=message,
+            html_body=html_message or '',
+            from_email=from_email,
+            recipients=recipients,
+        ))
+        if len(batch) >= batch_size:
+            EmailOutbox.objects.bulk_create(batch)
+            queued += len(batch)
+            batch = []
+
+    if batch:
+        EmailOutbox.objects.bulk_create(batch)
+        queued += len(batch)
+    return queued
+
+def release_stale_claims():
+    """Put back rows claimed by a worker that died mid-batch"""
+    timeout = outbox_setting('EMAIL_OUTBOX_CLAIM_TIMEOUT', 600)
+    cutoff = timezone.now() - timedelta(seconds=timeout)
+    return EmailOutbox.objects.filter(
+        status='sending', claimed_at__lt=cutoff
+    ).update(status='queued', claim_token=None, claimed_at=None)
+
+def claim_batch(batch_size):
+    """Claim up to batch_size due messages for this worker.
+
+    The conditional UPDATE only touches rows that are still queued, so
+    concurrent workers get disjoint batches on any database backend.
+    """
+    now = timezone.now()
+    due_ids = list(
+        EmailOutbox.objects.filter(status='queued', next_attempt_at__lte=now)
+        .order_by('next_attempt_at', 'id')
+        .values_list('id', flat=True)[:batch_size]
+    )
+    if not due_ids:
+        return []
+
+    token = uuid.uuid4()
+    EmailOutbox.objects.filter(id__in=due_ids, status='queued').update(
+        status='sending', claim_token=token, claimed_at=now
+    )
+    return list(EmailOutbox.objects.filter(claim_token=token).order_by('next_attempt_at', 'id'))
+
+def retry_delay(attempts):
+    """Exponential backoff: 1, 2, 4, 8... minutes, capped"""
+    base = outbox_setting('EMAIL_OUTBOX_RETRY_BASE', 60)
+    cap = outbox_setting('EMAIL_OUTBOX_RETRY_MAX', 3600)
+    return timedelta(seconds=min(base * (2 ** (attempts - 1)), cap))
+
+def build_message(entry, connection):
+    message = EmailMultiAlternatives(
+        subject=entry.subject,
+        body=entry.body,
+        from_email=entry.from_email or settings.DEFAULT_FROM_EMAIL,
+        to=entry.recipients,
+        connection=connection,
+    )
+    if entry.html_body:
+        message.attach_alternative(entry.html_body, 'text/html')
+    return message
+
+def mark_sent(entry):
+    entry.status = 'sent'
+    entry.attempts += 1
+    entry.sent_at = timezone.now()
+    entry.last_error = ''
+    entry.claim_token = None
+    entry.save(update_fields=['status', 'attempts', 'sent_at', 'last_error', 'claim_token'])
+
+def mark_failed(entry, error):
+    max_attempts = outbox_setting('EMAIL_OUTBOX_MAX_ATTEMPTS', 6)
+    entry.attempts += 1
+    entry.last_error = str(error)[:2000]
+    entry.claim_token = None
+    if entry.attempts >= max_attempts:
+        entry.status = 'failed'
+    else:
+        entry.status = 'queued'
+        entry.next_attempt_at = timezone.now() + retry_delay(entry.attempts)
+    entry.save(update_fields=['status', 'attempts', 'last_error', 'next_attempt_at', 'claim_token'])
+
+def deliver_batch(batch_size=None, connection=None):
+    """Send one batch of due emails over a single SMTP connection.
+
+    Messages are passed to send_messages() one at a time on the open
+    connection so each row gets its own sent/failed status, and sends are
+    spaced out to stay under EMAIL_OUTBOX_RATE_PER_MINUTE.
+    Returns (sent, failed) counts.
+    """
+    batch_size = batch_size or outbox_setting('EMAIL_OUTBOX_BATCH_SIZE', 50)
+    rate = outbox_setting('EMAIL_OUTBOX_RATE_PER_MINUTE', 20)
+    min_interval = 60.0 / rate if rate else 0
+
+    release_stale_claims()
+    batch = claim_batch(batch_size)
+    if not batch:
+        return 0, 0
+
+    connection = connection or get_connection(fail_silently=False)
+    sent = failed = 0
+    last_send = None
+
+    try:
+        connection.open()
+    except Exception as e:
+        # SMTP is down - push the whole batch back with backoff
+        for entry in batch:
+            mark_failed(entry, e)
+        return 0, len(batch)
+
+    try:
+        for entry in batch:
+            if last_send is not None and min_interval:
+                wait = min_interval - (time.monotonic() - last_send)
+                if wait > 0:
+                    time.sleep(wait)
+            last_send = time.monotonic()
+
+            try:
+                if connection.send_messages([build_message(entry, connection)]):
+                    mark_sent(entry)
+                    sent += 1
+                else:
+                    mark_failed(entry, 'Message was not accepted by the mail server')
+                    failed += 1
+            except Exception as e:
+                mark_failed(entry, e)
+                failed += 1
+    finally:
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    return sent, failed
+'''
+
+# ===== 3. OUTBOX WORKER COMMAND =====
+OUTBOX_WORKER_COMMAND = '''
+# notifications/management/commands/send_queued_emails.py - Create this file
+# Run as a PythonAnywhere always-on task: python manage.py send_queued_emails
+# Or as a scheduled task that drains the queue: python manage.py send_queued_emails --once
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from notifications.outbox import deliver_batch
+
+class Command(BaseCommand):
+    help = 'Deliver queued emails from the EmailOutbox table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+                            help='Drain the queue and exit instead of polling')
+        parser.add_argument('--batch-size', type=int, default=None)
+        parser.add_argument('--poll-interval', type=float, default=10.0,
+                            help='Seconds to sleep when the queue is empty')
+
+    def handle(self, *args, **options):
+        total_sent = total_failed = 0
+
+        while True:
+            close_old_connections()
+            sent, failed = deliver_batch(batch_size=options['batch_size'])
+            total_sent += sent
+            total_failed += failed
+
+            if sent or failed:
+                self.stdout.write(f"Sent {sent}, failed {failed}")
+                continue
+
+            if options['once']:
+                break
+            time.sleep(options['poll_interval'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Outbox drained: {total_sent} sent, {total_failed} failed"
+        ))
+'''
+
+# ===== 4. OUTBOX ADMIN =====
+OUTBOX_ADMIN = '''
+# notifications/admin.py - Add this
+
+from django.contrib import admin
+from django.utils import timezone
+
+from .models import EmailOutbox
+
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = ['subject', 'status', 'attempts', 'next_attempt_at', 'sent_at', 'created_at']
+    list_filter = ['status']
+    search_fields = ['subject', 'last_error']
+    readonly_fields = ['claim_token', 'claimed_at', 'sent_at', 'created_at']
+    actions = ['retry_now']
+
+    @admin.action(description='Retry selected emails now')
+    def retry_now(self, request, queryset):
+        updated = queryset.exclude(status='sent').update(
+            status='queued', attempts=0, next_attempt_at=timezone.now(),
+            claim_token=None, claimed_at=None
+        )
+        self.message_user(request, f"{updated} emails queued for retry")
+'''
+
+# ===== 5. OUTBOX SETTINGS =====
+OUTBOX_SETTINGS = '''
+# settings.py - Add these settings
+
+INSTALLED_APPS += ['notifications']
+
+# Keep the outbox row in the same transaction as the view's changes
+ATOMIC_REQUESTS = True  # inside DATABASES['default']
+
+EMAIL_OUTBOX_BATCH_SIZE = 50        # Emails per SMTP connection
+EMAIL_OUTBOX_RATE_PER_MINUTE = 20   # Stay under the Gmail sending limit
+EMAIL_OUTBOX_MAX_ATTEMPTS = 6       # Then mark the email as failed
+EMAIL_OUTBOX_RETRY_BASE = 60        # Seconds before the first retry (doubles each time)
+EMAIL_OUTBOX_RETRY_MAX = 3600       # Longest wait between retries
+EMAIL_OUTBOX_CLAIM_TIMEOUT = 600    # Requeue emails claimed by a crashed worker
+EMAIL_TIMEOUT = 30                  # Don't let a stuck SMTP server hang the worker
+'''
+
+print("EMAIL OUTBOX SYSTEM READY!")
+print("Add to your Django backend:")
+print("1. Create a notifications app: python manage.py startapp notifications")
+print("2. Add OUTBOX_MODEL to notifications/models.py")
+print("3. Create notifications/outbox.py from OUTBOX_QUEUE")
+print("4. Create the send_queued_emails command from OUTBOX_WORKER_COMMAND")
+print("5. Add OUTBOX_ADMIN to notifications/admin.py")
+print("6. Add OUTBOX_SETTINGS to settings.py")
+print("7. Run: python manage.py makemigrations notifications")
+print("8. Run: python manage.py migrate")
+print("9. Add an always-on task: python manage.py send_queued_emails")
+print("10. Reload PythonAnywhere web app")
+print("")
+print("Features:")
+print("✅ Emails saved in the same transaction as approvals")
+print("✅ Approval endpoints no longer wait on SMTP")
+print("✅ One SMTP connection per batch")
+print("✅ Retry with exponential backoff")
+print("✅ Rate limiting for Gmail")
+print("✅ Per-email sent/failed status in Django admin")
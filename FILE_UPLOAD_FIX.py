@@ -3,6 +3,8 @@
 # 1. ADD TO DJANGO SETTINGS.PY
 """
 # File Upload Settings
+# Large or flaky-connection uploads should use the resumable chunked uploads
+# in CHUNKED_UPLOAD_SYSTEM.py, which stream to disk instead of worker memory
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10485760  # 10MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10485760  # 10MB
 DATA_UPLOAD_MAX_NUMBER_FIELDS = 1000
@@ -0,0 +1,393 @@
+# MEDIA STORAGE SYSTEM - CONTENT-ADDRESSED, DEDUPLICATED UPLOADS
+
+# Uploads used to land in flat folders (documents/, applications/,
+# payments/evidence/...). Members upload the same ID scan again for every
+# application and retry, and folders with tens of thousands of files are slow
+# to list and back up. With this storage every FileField points at a blob
+# named by the SHA-256 of its bytes in a sharded tree:
+#
+#   media/blobs/ab/cd/abcdef0123...ef.jpg
+#
+# Identical uploads share one blob, a StoredBlob row counts the references,
+# and a blob is deleted when its last reference goes. Blobs never change once
+# written, so backups only need to copy new files.
+
+# ===== 1. BLOB MODEL =====
+BLOB_MODEL = '''
+# media_store/models.py - Add this model
+
+from django.db import models
+from django.utils import timezone
+
+class StoredBlob(models.Model):
+    sha256 = models.CharField(max_length=64, unique=True)
+    name = models.CharField(max_length=255)  # Storage name, e.g. blobs/ab/cd/<sha256>.pdf
+    size = models.BigIntegerField()
+    refcount = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Set on every refcount change; recount_blobs leaves recently touched blobs alone
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.name} ({self.refcount} refs)"
+'''
+
+# ===== 2. CONTENT-ADDRESSED STORAGE =====
+BLOB_STORAGE = '''
+# media_store/storage.py - Create this file
+
+import hashlib
+import os
+import re
+import tempfile
+
+from django.core.files.storage import FileSystemStorage
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+BLOB_PREFIX = 'blobs'
+BLOB_NAME_RE = re.compile(r'^blobs/[0-9a-f]{2}/[0-9a-f]{2}/([0-9a-f]{64})(\\.[A-Za-z0-9]{1,10})?$')
+
+def blob_name(sha256, original_name):
+    extension = os.path.splitext(original_name)[1].lower()
+    if not re.match(r'^\\.[a-z0-9]{1,10}$', extension):
+        extension = ''
+    return f'{BLOB_PREFIX}/{sha256[:2]}/{sha256[2:4]}/{sha256}{extension}'
+
+def blob_sha256(name):
+    match = BLOB_NAME_RE.match(name or '')
+    return match.group(1) if match else None
+
+class ContentAddressedStorage(FileSystemStorage):
+    """FileSystemStorage that stores each distinct file once, named by its SHA-256.
+
+    The name passed in (upload_to + filename) only contributes the extension.
+    If the content carries a precomputed sha256 attribute (chunked uploads do)
+    and that blob already exists, the content is only read if the file is gone.
+
+    Adding and dropping a reference both hold the StoredBlob row lock while
+    they check, write or unlink the file, so a blob can't be deleted between
+    a new reference seeing its file and counting itself.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # Blob names are unique by construction; never add a random suffix
+        return name
+
+    def _save(self, name, content):
+        from .models import StoredBlob
+
+        sha256 = getattr(content, 'sha256', None)
+        if sha256 and StoredBlob.objects.filter(sha256=sha256).exists():
+            return self.add_reference(sha256, name, getattr(content, 'size', 0), content=content)
+
+        tmp_path, sha256, size = self.write_temp(content)
+        try:
+            return self.add_reference(sha256, name, size, tmp_path=tmp_path)
+        finally:
+            if os.path.exists(tmp_path):  # Blob file already existed
+                os.unlink(tmp_path)
+
+    def write_temp(self, content):
+        """Hash while copying into a temp file inside MEDIA_ROOT -> (path, sha256, size)"""
+        blob_root = self.path(BLOB_PREFIX)
+        os.makedirs(blob_root, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=blob_root, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                if hasattr(content, 'seek'):
+                    content.seek(0)
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    tmp.write(chunk)
+                    size += len(chunk)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+        return tmp_path, digest.hexdigest(), size
+
+    def ensure_blob_file(self, name, tmp_path=None, content=None):
+        """Put the blob's file in place if it is missing; call with the row locked"""
+        final_path = self.path(name)
+        if os.path.exists(final_path):
+            return
+        if tmp_path is None:
+            tmp_path, _, _ = self.write_temp(content)
+        os.makedirs(os.path.dirname(final_path), exist_ok=True)
+        os.chmod(tmp_path, self.file_permissions_mode or 0o644)
+        os.replace(tmp_path, final_path)
+
+    def add_reference(self, sha256, name, size, tmp_path=None, content=None):
+        from .models import StoredBlob
+
+        for _ in range(3):
+            with transaction.atomic():
+                blob = StoredBlob.objects.select_for_update().filter(sha256=sha256).first()
+                if blob is None:
+                    try:
+                        # The new row stays locked by this transaction until it commits
+                        with transaction.atomic():
+                            blob = StoredBlob.objects.create(
+                                sha256=sha256, name=blob_name(sha256, name), size=size or 0,
+                            )
+                    except IntegrityError:
+                        continue  # Created by another upload; lock it on the next pass
+                self.ensure_blob_file(blob.name, tmp_path, content)
+                StoredBlob.objects.filter(id=blob.id).update(
+                    refcount=F('refcount') + 1, updated_at=timezone.now()
+                )
+                return blob.name
+        raise IntegrityError(f'Could not reference blob {sha256}')
+
+    def delete(self, name):
+        """Drop one reference; the file goes when the last one does"""
+        from .models import StoredBlob
+
+        sha256 = blob_sha256(name)
+        if sha256 is None:
+            # Legacy file from before the blob layout
+            return super().delete(name)
+
+        with transaction.atomic():
+            blob = StoredBlob.objects.select_for_update().filter(sha256=sha256).first()
+            if blob is None:
+                return
+            if blob.refcount > 1:
+                StoredBlob.objects.filter(id=blob.id).update(
+                    refcount=F('refcount') - 1, updated_at=timezone.now()
+                )
+                return
+            blob.delete()
+            # Under the row lock: add_reference re-checks the file once it gets the lock
+            self.delete_blob_file(blob.name)
+
+    def delete_blob_file(self, name):
+        super().delete(name)
+'''
+
+# ===== 3. RELEASE FILES ON DELETE =====
+BLOB_SIGNALS = '''
+# media_store/signals.py - Create this file, import it from MediaStoreConfig.ready()
+#
+# Django leaves files behind when a row is deleted or a FileField is replaced.
+# These handlers give the reference back so shared blobs are freed correctly.
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models import FileField
+from django.db.models.signals import post_delete, post_init, post_save
+
+from .storage import blob_sha256
+
+def file_fields(model):
+    return [field for field in model._meta.get_fields() if isinstance(field, FileField)]
+
+def release(storage, name):
+    if blob_sha256(name):
+        # After commit, so a rolled back delete keeps its reference
+        transaction.on_commit(lambda: storage.delete(name))
+
+def stored_name(instance, field):
+    # Read __dict__ directly: the descriptor would load deferred fields one query per row
+    value = instance.__dict__.get(field.attname)
+    return getattr(value, 'name', value)
+
+def remember_files(sender, instance, **kwargs):
+    instance._blob_names = {field.attname: stored_name(instance, field) for field in file_fields(sender)}
+
+def release_replaced_files(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_blob_names', {})
+    for field in file_fields(sender):
+        old_name = previous.get(field.attname)
+        new_name = stored_name(instance, field)
+        if old_name and old_name != new_name:
+            release(field.storage, old_name)
+    remember_files(sender, instance)
+
+def release_deleted_files(sender, instance, **kwargs):
+    for field in file_fields(sender):
+        name = stored_name(instance, field)
+        if name:
+            release(field.storage, name)
+
+def connect_blob_signals():
+    for model in apps.get_models():
+        if file_fields(model):
+            post_init.connect(remember_files, sender=model, weak=False)
+            post_save.connect(release_replaced_files, sender=model, weak=False)
+            post_delete.connect(release_deleted_files, sender=model, weak=False)
+
+# media_store/apps.py
+from django.apps import AppConfig
+
+class MediaStoreConfig(AppConfig):
+    name = 'media_store'
+
+    def ready(self):
+        from .signals import connect_blob_signals
+        connect_blob_signals()
+'''
+
+# ===== 4. MIGRATE AND RECOUNT COMMANDS =====
+BLOB_COMMANDS = '''
+# media_store/management/commands/migrate_media_to_blobs.py - Create this file
+# Run once after switching storage: python manage.py migrate_media_to_blobs
+
+import os
+
+from django.apps import apps
+from django.core.files import File
+from django.core.management.base import BaseCommand
+from django.db.models import FileField
+
+from media_store.storage import blob_sha256
+
+class Command(BaseCommand):
+    help = 'Move existing uploads into the content-addressed blob tree'
+
+    def handle(self, *args, **options):
+        moved = 0
+        legacy_paths = set()  # Removed at the end; rows may share a legacy file
+        for model in apps.get_models():
+            for field in model._meta.get_fields():
+                if not isinstance(field, FileField):
+                    continue
+                storage = field.storage
+                rows = model.objects.exclude(**{field.attname: ''}).values_list('pk', field.attname)
+                for pk, name in rows.iterator():
+                    if not name or blob_sha256(name):
+                        continue
+                    legacy_path = storage.path(name)
+                    if not os.path.exists(legacy_path):
+                        self.stderr.write(f'Missing: {name}')
+                        continue
+                    with open(legacy_path, 'rb') as f:
+                        new_name = storage.save(name, File(f, name=name))
+                    # update() keeps the signals from releasing anything
+                    model.objects.filter(pk=pk).update(**{field.attname: new_name})
+                    legacy_paths.add(legacy_path)
+                    moved += 1
+        for legacy_path in legacy_paths:
+            os.unlink(legacy_path)
+        self.stdout.write(self.style.SUCCESS(f'Moved {moved} files into blobs/'))
+
+# media_store/management/commands/recount_blobs.py - Create this file
+# Schedule weekly: python manage.py recount_blobs
+#
+# A first pass counts references to find blobs whose refcount looks wrong.
+# Each of those is then locked and counted again before it is fixed or
+# deleted. Blobs whose refcount changed within the grace period are skipped:
+# an upload may have counted its reference before its row was committed.
+
+from collections import Counter
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import FileField
+from django.utils import timezone
+
+from media_store.models import StoredBlob
+from media_store.storage import blob_sha256
+
+def file_fields():
+    for model in apps.get_models():
+        for field in model._meta.get_fields():
+            if isinstance(field, FileField):
+                yield model, field
+
+def count_references(name):
+    return sum(model.objects.filter(**{field.attname: name}).count() for model, field in file_fields())
+
+class Command(BaseCommand):
+    help = 'Recompute blob reference counts from the FileFields and delete orphans'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--grace-hours', type=float,
+                            default=getattr(settings, 'BLOB_RECOUNT_GRACE_HOURS', 24),
+                            help='Leave blobs whose refcount changed this recently alone')
+        parser.add_argument('--dry-run', action='store_true', help='Report only')
+
+    def handle(self, *args, **options):
+        counts = Counter()
+        for model, field in file_fields():
+            names = model.objects.exclude(**{field.attname: ''}).values_list(field.attname, flat=True)
+            for name in names.iterator():
+                sha256 = blob_sha256(name)
+                if sha256:
+                    counts[sha256] += 1
+
+        cutoff = timezone.now() - timedelta(hours=options['grace_hours'])
+        suspects = [
+            blob_id
+            for blob_id, sha256, refcount in StoredBlob.objects.filter(updated_at__lt=cutoff)
+            .values_list('id', 'sha256', 'refcount').iterator()
+            if counts.get(sha256, 0) != refcount
+        ]
+
+        fixed = removed = 0
+        for blob_id in suspects:
+            with transaction.atomic():
+                blob = StoredBlob.objects.select_for_update().filter(id=blob_id, updated_at__lt=cutoff).first()
+                if blob is None:
+                    continue  # Deleted or touched since the first pass
+                refcount = count_references(blob.name)
+                if refcount == blob.refcount:
+                    continue
+                if options['dry_run']:
+                    self.stdout.write(f'{blob.name}: refcount {blob.refcount}, {refcount} references')
+                elif refcount == 0:
+                    blob.delete()
+                    default_storage.delete_blob_file(blob.name)
+                else:
+                    StoredBlob.objects.filter(id=blob.id).update(refcount=refcount)
+                if refcount == 0:
+                    removed += 1
+                else:
+                    fixed += 1
+        verb = 'Would fix' if options['dry_run'] else 'Fixed'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {fixed} counts, removed {removed} orphaned blobs'))
+'''
+
+# ===== 5. STORAGE SETTINGS =====
+BLOB_SETTINGS = '''
+# settings.py - Add these settings
+
+INSTALLED_APPS += ['media_store.apps.MediaStoreConfig']
+
+# Django 4.2+
+STORAGES = {
+    'default': {'BACKEND': 'media_store.storage.ContentAddressedStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+# Older Django
+DEFAULT_FILE_STORAGE = 'media_store.storage.ContentAddressedStorage'
+
+BLOB_RECOUNT_GRACE_HOURS = 24  # recount_blobs skips blobs referenced or released this recently
+'''
+
+print("MEDIA STORAGE SYSTEM READY!")
+print("Add to your Django backend:")
+print("1. Create a media_store app: python manage.py startapp media_store")
+print("2. Add BLOB_MODEL to media_store/models.py")
+print("3. Create media_store/storage.py from BLOB_STORAGE")
+print("4. Create media_store/signals.py and apps.py from BLOB_SIGNALS")
+print("5. Create the migrate_media_to_blobs and recount_blobs commands")
+print("6. Add BLOB_SETTINGS to settings.py")
+print("7. Run: python manage.py makemigrations media_store")
+print("8. Run: python manage.py migrate")
+print("9. Back up media/, then run once: python manage.py migrate_media_to_blobs")
+print("10. Schedule weekly: python manage.py recount_blobs")
+print("11. Reload PythonAnywhere web app")
+print("")
+print("Features:")
+print("✅ Re-uploaded ID scans stored once")
+print("✅ Sharded blobs/ab/cd/ tree keeps folders small")
+print("✅ Reference counting frees a blob with its last user")
+print("✅ Blobs never change, so backups are incremental")
@@ -4,8 +4,9 @@
 MODELS_UPDATE = '''
 from django.db import models
 from django.contrib.auth.models import User
-from django.core.mail import send_mail
+from django.db import transaction
 from django.conf import settings
+from notifications.outbox import queue_email
 
 class UserProfile(models.Model):
     MEMBERSHIP_TYPES = [
@@ -91,15 +92,17 @@ class MembershipApplication(models.Model):
     
     def save(self, *args, **kwargs):
         is_new = self.pk is None
-        super().save(*args, **kwargs)
-        
-        if is_new:
-            self.send_membership_email()
+        # Queued email commits (or rolls back) together with the application
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            
+            if is_new:
+                self.send_membership_email()
     
     def send_membership_email(self):
         # DIFFERENT EMAIL FOR MEMBERSHIP
         subject = f'Pamoja Membership Application Received - {self.membership_type.title()} Family'
-        message = f'''
+        message = f"""
         Dear {self.first_name} {self.last_name},
         
         Thank you for applying for Pamoja {self.membership_type} family membership!
@@ -121,8 +124,8 @@ class MembershipApplication(models.Model):
         
         Best regards,
         Pamoja Administration Team
-        '''
-        send_mail(subject, message, settings.DEFAULT_FROM_EMAIL, [self.email])
+        """
+        queue_email(subject, message, [self.email])
 
 class Document(models.Model):
     DOCUMENT_TYPES = [
@@ -189,7 +192,11 @@ from django.http import JsonResponse, HttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.contrib.auth.decorators import login_required
+from django.db import transaction
 from django.shortcuts import get_object_or_404
+from response_cache.versions import cached_payload
+from uploads.chunked import upload_or_file
+from .file_serving import serve_file
 from .models import UserProfile, MembershipApplication, MembershipPayment, Document
 import json
 import os
@@ -360,16 +367,18 @@ def submit_membership_payment(request):
             user=request.user
         ).order_by('-created_at').first()
         
-        payment = MembershipPayment.objects.create(
-            user=request.user,
-            application=application,
-            payment_type='membership_fee',
-            payment_method=request.POST.get('payment_method'),
-            amount=request.POST.get('amount'),
-            transaction_id=request.POST.get('transaction_id'),
-            evidence_file=request.FILES.get('evidence_file'),
-            notes=request.POST.get('notes', ''),
-        )
+        # The evidence may be a multipart file or a chunked upload token
+        with transaction.atomic():
+            payment = MembershipPayment.objects.create(
+                user=request.user,
+                application=application,
+                payment_type='membership_fee',
+                payment_method=request.POST.get('payment_method'),
+                amount=request.POST.get('amount'),
+                transaction_id=request.POST.get('transaction_id'),
+                evidence_file=upload_or_file(request, 'evidence_file'),
+                notes=request.POST.get('notes', ''),
+            )
         
         return JsonResponse({
             'success': True,
@@ -382,6 +391,10 @@ def submit_membership_payment(request):
 # GET ALL DOCUMENTS
 @csrf_exempt
 def get_documents(request):
+    # Cached until an admin saves or deletes a public document
+    return JsonResponse(cached_payload('documents', ['public'], document_list_payload))
+
+def document_list_payload(audiences):
     documents = Document.objects.filter(is_public=True).order_by('document_type', 'title')
     documents_data = [{
         'id': doc.id,
@@ -392,19 +405,20 @@ def get_documents(request):
         'created_at': doc.created_at.isoformat(),
     } for doc in documents]
     
-    return JsonResponse({'documents': documents_data})
+    return {'documents': documents_data}
 
 # VIEW DOCUMENT
 @csrf_exempt
+@require_http_methods(["GET", "HEAD"])
 def view_document(request, document_id):
     document = get_object_or_404(Document, id=document_id)
     
     if document.file:
-        response = HttpResponse(document.file.read(), content_type='application/pdf')
-        response['Content-Disposition'] = f'inline; filename="{document.title}.pdf"'
-        return response
-    else:
-        return JsonResponse({'error': 'Document file not found'}, status=404)
+        extension = os.path.splitext(document.file.name)[1] or '.pdf'
+        response = serve_file(request, document.file.path, f'{document.title}{extension}')
+        if response is not None:
+            return response
+    return JsonResponse({'error': 'Document file not found'}, status=404)
 
 # GET USER'S APPLICATIONS HISTORY
 @csrf_exempt
@@ -434,6 +448,135 @@ def get_user_applications(request):
     return JsonResponse({'applications': applications_data})
 '''
 
+# ===== FILE_SERVING.PY - Create this file next to views.py =====
+FILE_SERVING = '''
+# file_serving.py - Serve stored files without reading them into Python
+#
+# With DOCUMENT_SENDFILE_MODE = 'x-accel-redirect' (nginx) or 'x-sendfile'
+# (Apache mod_xsendfile) the view only sets a header and the web server
+# sends the bytes, including Range requests. Otherwise FileResponse hands the
+# open file to the WSGI server, which uses sendfile() where it can, and
+# single byte ranges are streamed from disk in blocks.
+
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe
+
+RANGE_RE = re.compile(r'^bytes=(\\d*)-(\\d*)$')
+BLOCK_SIZE = 64 * 1024
+
+
+def file_etag(stat):
+    """Strong validator from the file's size and modification time (as nginx does)"""
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
+def parse_range(header, size):
+    """Return (start, end) for a single satisfiable range, None to send the
+    whole file (no/unsupported Range header), or False if unsatisfiable"""
+    match = RANGE_RE.match(header.strip()) if header else None
+    if not match or match.group(1) == match.group(2) == '':
+        return None
+
+    first, last = match.groups()
+    if first == '':
+        # bytes=-500 means the last 500 bytes
+        start, end = max(0, size - int(last)), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+
+    # Empty once resolved, e.g. bytes=-0 or any range of a 0-byte file
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def if_range_matches(request, etag, last_modified):
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range:
+        return True
+    if if_range.startswith('"'):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
+
+
+def read_range(path, start, end):
+    with open(path, 'rb') as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            block = f.read(min(BLOCK_SIZE, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+            yield block
+
+
+def sendfile_response(path):
+    mode = getattr(settings, 'DOCUMENT_SENDFILE_MODE', None)
+    if mode == 'x-accel-redirect':
+        # nginx: location /protected-media/ { internal; alias <MEDIA_ROOT>/; }
+        relative = os.path.relpath(path, settings.MEDIA_ROOT).replace(os.sep, '/')
+        prefix = getattr(settings, 'DOCUMENT_ACCEL_PREFIX', '/protected-media/')
+        response = HttpResponse()
+        response['X-Accel-Redirect'] = prefix + relative
+        return response
+    if mode == 'x-sendfile':
+        response = HttpResponse()
+        response['X-Sendfile'] = path
+        return response
+    return None
+
+
+def serve_file(request, path, filename, content_type=None, as_attachment=False):
+    """Serve path with ETag/Last-Modified, 304 revalidation and byte ranges"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+
+    etag = file_etag(stat)
+    last_modified = int(stat.st_mtime)
+    content_type = content_type or mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = sendfile_response(path)
+    if response is None:
+        byte_range = None
+        if request.method == 'GET' and if_range_matches(request, etag, last_modified):
+            byte_range = parse_range(request.META.get('HTTP_RANGE'), stat.st_size)
+
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{stat.st_size}'
+        elif byte_range:
+            start, end = byte_range
+            response = StreamingHttpResponse(read_range(path, start, end), status=206,
+                                             content_type=content_type)
+            response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+            response['Content-Length'] = str(end - start + 1)
+        else:
+            response = FileResponse(open(path, 'rb'), content_type=content_type)
+
+    if response.status_code in (200, 206):
+        # Escapes quotes and adds filename*= for non-ASCII titles (Django 4.2+)
+        response['Content-Disposition'] = content_disposition_header(as_attachment, filename)
+        response['Content-Type'] = content_type
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    # Private documents go through here too, so shared proxies must not store them
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+'''
+
 # ===== URLS.PY - Add these URLs =====
 URLS_UPDATE = '''
 from django.urls import path
@@ -472,6 +615,11 @@ DEFAULT_FROM_EMAIL = 'Pamoja <your-email@gmail.com>'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Let the web server send document bytes: 'x-accel-redirect' (nginx),
+# 'x-sendfile' (Apache) or None to stream from Django
+DOCUMENT_SENDFILE_MODE = None
+DOCUMENT_ACCEL_PREFIX = '/protected-media/'
+
 # Serve media files in development
 from django.conf.urls.static import static
 if settings.DEBUG:
@@ -481,7 +629,7 @@ if settings.DEBUG:
 print("MEMBERSHIP BACKEND UPDATES READY!")
 print("Add to your Django backend:")
 print("1. Update MODELS in models.py")
-print("2. Add VIEWS to views.py")
+print("2. Add VIEWS to views.py and FILE_SERVING as file_serving.py")
 print("3. Add URLS to urls.py")
 print("4. Configure EMAIL_SETTINGS in settings.py")
 print("5. Run: python manage.py makemigrations")
@@ -490,10 +638,11 @@ print("7. Upload documents via Django admin")
 print("8. Reload PythonAnywhere web app")
 print("")
 print("Features:")
-print("✅ Different membership email")
+print("✅ Different membership email (queued via EMAIL_OUTBOX_SYSTEM.py)")
 print("✅ Redirect to membership payment")
 print("✅ View current membership status")
 print("✅ Admin can create applications for users")
 print("✅ All application data saved and retrievable")
 print("✅ Document viewing in webapp")
+print("✅ Documents served with Range, ETag/304 and optional X-Sendfile")
 print("✅ Complete frontend-backend communication")
\ No newline at end of file
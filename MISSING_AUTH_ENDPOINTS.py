@@ -15,6 +15,7 @@ from django.contrib.auth.models import User
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
+from users.hashing import PasswordHashingBusy, hash_password, password_busy_response
 import json
 
 @csrf_exempt
@@ -25,6 +26,7 @@ def auth_login(request):
         username = data.get('username')
         password = data.get('password')
         
+        # Password check runs on the bounded hashing pool (BoundedModelBackend)
         user = authenticate(request, username=username, password=password)
         if user:
             login(request, user)
@@ -40,6 +42,8 @@ def auth_login(request):
             })
         else:
             return JsonResponse({'error': 'Invalid credentials'}, status=400)
+    except PasswordHashingBusy:
+        return password_busy_response()
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=400)
 
@@ -60,13 +64,15 @@ def auth_register(request):
         if User.objects.filter(email=email).exists():
             return JsonResponse({'error': 'Email already exists'}, status=400)
         
-        user = User.objects.create_user(
-            username=username,
-            email=email,
-            password=password,
+        # Hash on the bounded pool, then save the already-hashed password
+        user = User(
+            username=User.normalize_username(username),
+            email=User.objects.normalize_email(email),
+            password=hash_password(password),
             first_name=first_name,
             last_name=last_name
         )
+        user.save()
         
         return JsonResponse({
             'success': True,
@@ -77,6 +83,8 @@ def auth_register(request):
                 'email': user.email,
             }
         })
+    except PasswordHashingBusy:
+        return password_busy_response()
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=400)
 
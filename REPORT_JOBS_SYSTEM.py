@@ -0,0 +1,540 @@
+# REPORT JOBS SYSTEM - BACKGROUND RENDERING FOR HEAVY ADMIN REPORTS
+
+# print_all_applications, print_financial_report and shares_report render
+# inside the web request, which ties up the single PythonAnywhere worker.
+# An admin now POSTs a report job, a worker command renders it to a file,
+# the frontend polls the job for status/progress and downloads the artifact.
+# A finished artifact is reused for the same report and parameters until the
+# tables it reads from change.
+
+# ===== 1. REPORT JOB MODEL =====
+REPORT_JOB_MODEL = '''
+# reports/models.py - Add this model
+
+from django.contrib.auth.models import User
+from django.db import models
+
+class ReportJob(models.Model):
+    KIND_CHOICES = [
+        ('applications_pdf', 'All Applications (PDF)'),
+        ('financial_pdf', 'Financial Report (PDF)'),
+        ('shares_json', 'Shares Report (JSON)'),
+    ]
+
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES)
+    params = models.JSONField(default=dict)
+    params_hash = models.CharField(max_length=64)
+    # Fingerprint of the source tables when the job was requested
+    data_version = models.CharField(max_length=64)
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    rows_done = models.PositiveIntegerField(default=0)
+    rows_total = models.PositiveIntegerField(null=True, blank=True)
+    error = models.TextField(blank=True)
+
+    artifact_path = models.CharField(max_length=500, blank=True)
+    content_type = models.CharField(max_length=100, blank=True)
+    filename = models.CharField(max_length=200, blank=True)
+
+    requested_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True,
+                                     related_name='report_jobs')
+    # Set when a worker claims the job, so two workers never render the same one
+    claim_token = models.UUIDField(null=True, blank=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['kind', 'params_hash', 'data_version', 'status']),
+            models.Index(fields=['status', 'created_at']),
+        ]
+        constraints = [
+            # At most one queued/running job per report, so concurrent
+            # requests for the same report cannot both queue a render
+            models.UniqueConstraint(
+                fields=['kind', 'params_hash', 'data_version'],
+                condition=models.Q(status__in=['queued', 'running']),
+                name='unique_active_report_job',
+            ),
+        ]
+
+    @property
+    def progress(self):
+        if self.status == 'done':
+            return 100
+        if not self.rows_total:
+            return 0
+        return min(99, int(self.rows_done * 100 / self.rows_total))
+
+    def __str__(self):
+        return f"{self.kind} #{self.id} ({self.status})"
+'''
+
+# ===== 2. REPORT JOB FUNCTIONS =====
+REPORT_JOB_FUNCTIONS = '''
+# reports/jobs.py - Create this file
+
+import hashlib
+import json
+import os
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Max, Sum
+from django.utils import timezone
+
+from admin_panel.views import (
+    APPLICATIONS_REPORT_TITLE, FINANCIAL_REPORT_TITLE,
+    application_report_lines, draw_report, financial_report_lines,
+)
+from applications.models import MembershipApplication
+from payments.models import MembershipPayment, SharePurchase
+from payments.views import build_shares_report, parse_histogram_edges
+from shares.models import ShareLedgerEntry
+from users.models import UserProfile
+
+from .models import ReportJob
+
+class InvalidReportRequest(ValueError):
+    pass
+
+def report_setting(name, default):
+    return getattr(settings, name, default)
+
+def report_dir():
+    # Outside MEDIA_ROOT: artifacts are only handed out by report_job_download
+    return report_setting('REPORT_JOB_DIR', os.path.join(settings.BASE_DIR, 'private', 'report_jobs'))
+
+# --- Report kinds ---
+
+# The version functions fingerprint the source tables from row counts and the
+# newest updated_at. Rows changed with QuerySet.update() keep their old
+# updated_at (auto_now only runs on save()), so such bulk changes are not seen
+# and a cached artifact is reused until a saved change or prune_old_jobs().
+
+def applications_version():
+    return MembershipApplication.objects.aggregate(count=Count('id'), changed=Max('updated_at'))
+
+def financial_version():
+    return MembershipPayment.objects.aggregate(count=Count('id'), changed=Max('updated_at'))
+
+def shares_version():
+    # Ledger entries are append-only, so the newest id moves on every share change
+    return {
+        **SharePurchase.objects.filter(status='approved').aggregate(
+            purchases=Count('id'), revenue=Sum('amount'),
+        ),
+        **ShareLedgerEntry.objects.aggregate(last_entry=Max('id')),
+        **UserProfile.objects.filter(shares_owned__gt=0).aggregate(holders=Count('id')),
+    }
+
+def clean_shares_params(params):
+    if not params.get('histogram'):
+        return {}
+    return {'histogram': parse_histogram_edges(str(params['histogram']))}
+
+def render_pdf(title, lines, total, job, out):
+    draw_report(title, track_progress(job, lines, total), pdf_file=out)
+
+def render_applications(job, out):
+    total = MembershipApplication.objects.count()
+    render_pdf(APPLICATIONS_REPORT_TITLE, application_report_lines(), total, job, out)
+
+def render_financial(job, out):
+    # +1 for the total revenue line
+    total = MembershipPayment.objects.filter(status='approved').count() + 1
+    render_pdf(FINANCIAL_REPORT_TITLE, financial_report_lines(), total, job, out)
+
+def render_shares(job, out):
+    report = build_shares_report(job.params.get('histogram'))
+    out.write(json.dumps(report, cls=DjangoJSONEncoder).encode('utf-8'))
+
+# kind -> (clean params, data version, render, content type, file extension)
+REPORT_KINDS = {
+    'applications_pdf': (lambda params: {}, applications_version, render_applications,
+                         'application/pdf', 'pdf'),
+    'financial_pdf': (lambda params: {}, financial_version, render_financial,
+                      'application/pdf', 'pdf'),
+    'shares_json': (clean_shares_params, shares_version, render_shares,
+                    'application/json', 'json'),
+}
+
+def fingerprint(value):
+    encoded = json.dumps(value, sort_keys=True, cls=DjangoJSONEncoder)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+# --- Requesting jobs ---
+
+def request_report(kind, params, user=None):
+    """Return a job for this report, reusing a current or in-flight one.
+
+    A done job with the same kind, parameters and data version is returned as
+    is, so the artifact is served without rendering again. A queued or
+    running job for the same report is shared instead of queueing a duplicate;
+    the unique_active_report_job constraint settles concurrent requests.
+    """
+    if kind not in REPORT_KINDS:
+        raise InvalidReportRequest(f'Unknown report: {kind}')
+    clean_params, version, _, _, _ = REPORT_KINDS[kind]
+    try:
+        params = clean_params(params or {})
+    except ValueError as e:
+        raise InvalidReportRequest(str(e))
+
+    params_hash = fingerprint(params)
+    data_version = fingerprint(version())
+
+    for attempt in range(3):
+        existing = ReportJob.objects.filter(
+            kind=kind, params_hash=params_hash, data_version=data_version,
+            status__in=['queued', 'running', 'done'],
+        ).order_by('-created_at').first()
+        if existing and (existing.status != 'done' or os.path.exists(existing.artifact_path)):
+            return existing, False
+
+        try:
+            with transaction.atomic():
+                job = ReportJob.objects.create(
+                    kind=kind, params=params, params_hash=params_hash,
+                    data_version=data_version, requested_by=user,
+                )
+            return job, True
+        except IntegrityError:
+            # A concurrent request queued the same report first; share its job
+            if attempt == 2:
+                raise
+
+# --- Running jobs ---
+
+def release_stale_claims():
+    """Requeue jobs claimed by a worker that died mid-render"""
+    timeout = report_setting('REPORT_JOB_CLAIM_TIMEOUT', 1800)
+    cutoff = timezone.now() - timedelta(seconds=timeout)
+    return ReportJob.objects.filter(status='running', claimed_at__lt=cutoff).update(
+        status='queued', claim_token=None, claimed_at=None, rows_done=0
+    )
+
+def claim_next_job():
+    """Claim the oldest queued job; the conditional UPDATE makes claims exclusive"""
+    job_id = (
+        ReportJob.objects.filter(status='queued')
+        .order_by('created_at', 'id')
+        .values_list('id', flat=True)
+        .first()
+    )
+    if job_id is None:
+        return None
+
+    token = uuid.uuid4()
+    claimed = ReportJob.objects.filter(id=job_id, status='queued').update(
+        status='running', claim_token=token, claimed_at=timezone.now()
+    )
+    return ReportJob.objects.get(id=job_id) if claimed else None
+
+def track_progress(job, lines, total):
+    """Pass lines through, saving rows_done every REPORT_JOB_PROGRESS_EVERY rows"""
+    every = report_setting('REPORT_JOB_PROGRESS_EVERY', 500)
+    ReportJob.objects.filter(id=job.id).update(rows_total=total)
+    done = 0
+    for line in lines:
+        yield line
+        done += 1
+        if done % every == 0:
+            ReportJob.objects.filter(id=job.id).update(rows_done=done)
+    ReportJob.objects.filter(id=job.id).update(rows_done=done)
+
+def run_job(job):
+    """Render job to REPORT_JOB_DIR and mark it done or failed"""
+    _, _, render, content_type, extension = REPORT_KINDS[job.kind]
+    os.makedirs(report_dir(), exist_ok=True)
+    path = os.path.join(report_dir(), f'{job.kind}_{job.id}.{extension}')
+    tmp_path = f'{path}.tmp'
+
+    try:
+        with open(tmp_path, 'wb') as out:
+            render(job, out)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        ReportJob.objects.filter(id=job.id).update(
+            status='failed', error=str(e)[:2000], claim_token=None, finished_at=timezone.now()
+        )
+        return False
+
+    ReportJob.objects.filter(id=job.id).update(
+        status='done', artifact_path=path, content_type=content_type,
+        filename=f'{job.kind}_{timezone.localdate():%Y%m%d}.{extension}',
+        claim_token=None, finished_at=timezone.now(),
+    )
+    return True
+
+def run_next_job():
+    """Claim and render one job. Returns None when the queue is empty."""
+    release_stale_claims()
+    job = claim_next_job()
+    if job is None:
+        return None
+    return run_job(job)
+
+def prune_old_jobs():
+    """Delete finished jobs and their files after REPORT_JOB_KEEP_DAYS"""
+    keep_days = report_setting('REPORT_JOB_KEEP_DAYS', 7)
+    cutoff = timezone.now() - timedelta(days=keep_days)
+    old_jobs = ReportJob.objects.filter(status__in=['done', 'failed'], created_at__lt=cutoff)
+    for path in old_jobs.exclude(artifact_path='').values_list('artifact_path', flat=True).iterator():
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+    deleted, _ = old_jobs.delete()
+    return deleted
+'''
+
+# ===== 3. REPORT WORKER COMMAND =====
+REPORT_WORKER_COMMAND = '''
+# reports/management/commands/run_report_jobs.py - Create this file
+# Run as a PythonAnywhere always-on task: python manage.py run_report_jobs
+# Or as a scheduled task that drains the queue: python manage.py run_report_jobs --once
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from reports.jobs import prune_old_jobs, run_next_job
+
+class Command(BaseCommand):
+    help = 'Render queued admin report jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+                            help='Drain the queue and exit instead of polling')
+        parser.add_argument('--poll-interval', type=float, default=5.0,
+                            help='Seconds to sleep when the queue is empty')
+
+    def handle(self, *args, **options):
+        done = failed = 0
+        pruned = prune_old_jobs()
+        if pruned:
+            self.stdout.write(f"Pruned {pruned} old report jobs")
+
+        while True:
+            close_old_connections()
+            result = run_next_job()
+
+            if result is not None:
+                if result:
+                    done += 1
+                else:
+                    failed += 1
+                continue
+
+            if options['once']:
+                break
+            time.sleep(options['poll_interval'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Report queue drained: {done} done, {failed} failed"
+        ))
+'''
+
+# ===== 4. REPORT JOB ENDPOINTS =====
+REPORT_JOB_ENDPOINTS = '''
+# reports/views.py - Create and poll report jobs, download finished artifacts
+
+import os
+
+from django.http import FileResponse
+from django.urls import reverse
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from .jobs import InvalidReportRequest, request_report
+from .models import ReportJob
+
+def job_payload(request, job):
+    payload = {
+        'id': job.id,
+        'kind': job.kind,
+        'params': job.params,
+        'status': job.status,
+        'progress': job.progress,
+        'rows_done': job.rows_done,
+        'rows_total': job.rows_total,
+        'error': job.error,
+        'created_at': job.created_at.isoformat(),
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+        'status_url': request.build_absolute_uri(reverse('report_job_status', args=[job.id])),
+        'download_url': None,
+    }
+    if job.status == 'done':
+        payload['download_url'] = request.build_absolute_uri(
+            reverse('report_job_download', args=[job.id])
+        )
+    return payload
+
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+def create_report_job(request):
+    """POST {"kind": "financial_pdf", "params": {...}} - 202 while rendering, 200 if ready"""
+    try:
+        job, _ = request_report(
+            request.data.get('kind'), request.data.get('params') or {}, user=request.user
+        )
+    except InvalidReportRequest as e:
+        return Response({'error': str(e)}, status=400)
+
+    return Response(job_payload(request, job), status=200 if job.status == 'done' else 202)
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def report_job_status(request, job_id):
+    try:
+        job = ReportJob.objects.get(id=job_id)
+    except ReportJob.DoesNotExist:
+        return Response({'error': 'Report job not found'}, status=404)
+    return Response(job_payload(request, job))
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def report_job_download(request, job_id):
+    try:
+        job = ReportJob.objects.get(id=job_id)
+    except ReportJob.DoesNotExist:
+        return Response({'error': 'Report job not found'}, status=404)
+
+    if job.status != 'done':
+        return Response({'error': f'Report is {job.status}'}, status=409)
+    if not os.path.exists(job.artifact_path):
+        return Response({'error': 'Report file has expired, request it again'}, status=410)
+
+    return FileResponse(open(job.artifact_path, 'rb'), as_attachment=True,
+                        filename=job.filename, content_type=job.content_type)
+
+# reports/urls.py
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('api/admin/reports/jobs/', views.create_report_job, name='create_report_job'),
+    path('api/admin/reports/jobs/<int:job_id>/', views.report_job_status, name='report_job_status'),
+    path('api/admin/reports/jobs/<int:job_id>/download/', views.report_job_download, name='report_job_download'),
+]
+'''
+
+# ===== 5. REPORT JOB ADMIN =====
+REPORT_JOB_ADMIN = '''
+# reports/admin.py - Add this
+
+from django.contrib import admin
+
+from .models import ReportJob
+
+@admin.register(ReportJob)
+class ReportJobAdmin(admin.ModelAdmin):
+    list_display = ['kind', 'status', 'rows_done', 'rows_total', 'requested_by', 'created_at', 'finished_at']
+    list_filter = ['kind', 'status']
+    readonly_fields = ['params_hash', 'data_version', 'claim_token', 'claimed_at', 'created_at', 'finished_at']
+'''
+
+# ===== 6. REPORT JOB SETTINGS =====
+REPORT_JOB_SETTINGS = '''
+# settings.py - Add these settings
+
+INSTALLED_APPS += ['reports']
+
+# Keep this outside MEDIA_ROOT: everything under MEDIA_ROOT is public at
+# MEDIA_URL. Reports are only downloaded through report_job_download.
+REPORT_JOB_DIR = os.path.join(BASE_DIR, 'private', 'report_jobs')
+REPORT_JOB_PROGRESS_EVERY = 500     # Rows between progress updates
+REPORT_JOB_CLAIM_TIMEOUT = 1800     # Requeue jobs claimed by a crashed worker
+REPORT_JOB_KEEP_DAYS = 7            # Delete finished jobs and files after this
+'''
+
+# ===== 7. REPORT JOB TESTS =====
+REPORT_JOB_TESTS = '''
+# reports/tests.py - Create this file
+
+import os
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from .jobs import report_dir
+from .models import ReportJob
+
+
+class ReportJobDownloadTests(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        path = os.path.join(self.tmp.name, 'shares_json_1.json')
+        with open(path, 'wb') as out:
+            out.write(b'{}')
+        self.job = ReportJob.objects.create(
+            kind='shares_json', params={}, params_hash='x', data_version='x', status='done',
+            artifact_path=path, content_type='application/json', filename='shares.json',
+        )
+        self.url = reverse('report_job_download', args=[self.job.id])
+        self.client = APIClient()
+
+    def test_staff_can_download(self):
+        admin = User.objects.create_superuser('admin', 'admin@example.com', 'pass')
+        self.client.force_authenticate(admin)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b'{}')
+
+    def test_member_is_refused(self):
+        member = User.objects.create_user('member', 'member@example.com', 'pass')
+        self.client.force_authenticate(member)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_anonymous_is_refused(self):
+        self.assertIn(self.client.get(self.url).status_code, (401, 403))
+
+    def test_report_dir_is_not_public(self):
+        media_root = os.path.realpath(settings.MEDIA_ROOT)
+        directory = os.path.realpath(report_dir())
+        self.assertNotEqual(os.path.commonpath([media_root, directory]), media_root)
+'''
+
+print("REPORT JOBS SYSTEM READY!")
+print("Add to your Django backend:")
+print("1. Create a reports app: python manage.py startapp reports")
+print("2. Add REPORT_JOB_MODEL to reports/models.py")
+print("3. Create reports/jobs.py from REPORT_JOB_FUNCTIONS")
+print("4. Create the run_report_jobs command from REPORT_WORKER_COMMAND")
+print("5. Add REPORT_JOB_ENDPOINTS to reports/views.py and reports/urls.py")
+print("6. Add REPORT_JOB_ADMIN to reports/admin.py")
+print("7. Add REPORT_JOB_SETTINGS to settings.py and REPORT_JOB_TESTS to reports/tests.py")
+print("8. Run: python manage.py makemigrations reports")
+print("9. Run: python manage.py migrate")
+print("10. Add an always-on task: python manage.py run_report_jobs")
+print("11. Reload PythonAnywhere web app")
+print("")
+print("Features:")
+print("✅ Big exports no longer block the web worker")
+print("✅ Status and progress polling")
+print("✅ Finished reports reused until the data changes")
+print("✅ Duplicate requests share one job")
+print("✅ Old report files cleaned up automatically")
@@ -0,0 +1,160 @@
+# RESPONSE CACHE SYSTEM - VERSIONED CACHING FOR MOSTLY-STATIC LISTS
+
+# get_documents and announcements_list return the same rows to every member
+# on every page view, but the rows only change when an admin edits them. The
+# payloads are now cached under a version number per audience:
+#
+#   announcements: all / members / admins   (Announcement.target_audience)
+#   documents:     public / private         (Document.is_public)
+#
+# Saving or deleting a row bumps the version of its audience (old and new
+# audience if it moved), so the next read misses and rebuilds. Old entries are
+# never read again and age out of the cache on their own.
+
+# ===== 1. VERSION FUNCTIONS =====
+VERSION_FUNCTIONS = '''
+# response_cache/__init__.py - Create empty
+# response_cache/versions.py - Create this file
+
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+
+def response_cache_setting(name, default):
+    return getattr(settings, name, default)
+
+def version_key(namespace, audience):
+    return f'version:{namespace}:{audience}'
+
+def fresh_version():
+    # Time-based, so an evicted version never restarts at a number already used
+    return int(time.time() * 1000)
+
+def get_versions(namespace, audiences):
+    """Current version per audience, creating missing ones"""
+    keys = {audience: version_key(namespace, audience) for audience in audiences}
+    found = cache.get_many(keys.values())
+    versions = {}
+    for audience, key in keys.items():
+        if key not in found:
+            cache.add(key, fresh_version(), None)
+            found[key] = cache.get(key)
+        versions[audience] = found[key]
+    return versions
+
+def bump_version(namespace, audience):
+    key = version_key(namespace, audience)
+    try:
+        cache.incr(key)
+    except ValueError:  # Evicted or never read
+        cache.set(key, fresh_version(), None)
+
+def cached_payload(namespace, audiences, build):
+    """build(audiences) cached until one of the audiences changes"""
+    versions = get_versions(namespace, sorted(set(audiences)))
+    key = f'response:{namespace}:' + ':'.join(f'{a}.{v}' for a, v in versions.items())
+    payload = cache.get(key)
+    if payload is None:
+        payload = build(list(versions))
+        cache.set(key, payload, response_cache_setting('RESPONSE_CACHE_TIMEOUT', 3600))
+    return payload
+
+def track_versioned_model(model, namespace, audience_field, audience_of):
+    """Bump the namespace version whenever a row of model is saved or deleted.
+
+    audience_of maps a value of audience_field to the audience name. Only
+    save() and delete() are seen; code that calls QuerySet.update() on these
+    models must call bump_version itself.
+    """
+
+    def remember_audience(sender, instance, raw=False, **kwargs):
+        # One query per admin save; reads pay nothing
+        instance._cached_audience = None
+        if instance.pk and not raw:
+            old = sender.objects.filter(pk=instance.pk).values_list(audience_field, flat=True).first()
+            if old is not None:
+                instance._cached_audience = audience_of(old)
+
+    def bump(sender, instance, **kwargs):
+        audiences = {audience_of(getattr(instance, audience_field))}
+        old = getattr(instance, '_cached_audience', None)
+        if old is not None:
+            audiences.add(old)
+        # After commit, so a reader can't cache the old rows under the new version
+        for audience in audiences:
+            transaction.on_commit(lambda audience=audience: bump_version(namespace, audience))
+
+    pre_save.connect(remember_audience, sender=model, weak=False)
+    post_save.connect(bump, sender=model, weak=False)
+    post_delete.connect(bump, sender=model, weak=False)
+'''
+
+# ===== 2. REGISTER THE MODELS =====
+VERSIONED_MODELS = '''
+# announcements/apps.py
+from django.apps import AppConfig
+
+class AnnouncementsConfig(AppConfig):
+    name = 'announcements'
+
+    def ready(self):
+        from response_cache.versions import track_versioned_model
+        from .feed import connect_feed_signals
+        from .models import Announcement
+        track_versioned_model(Announcement, 'announcements', 'target_audience', str)
+        connect_feed_signals()  # Tombstones for the ?since= feed (ANNOUNCEMENTS_FEED)
+
+# apps.py of the app holding Document (MEMBERSHIP_BACKEND_UPDATES.py) - add to ready()
+    def ready(self):
+        from response_cache.versions import track_versioned_model
+        from .models import Document
+        track_versioned_model(Document, 'documents', 'is_public',
+                              lambda is_public: 'public' if is_public else 'private')
+'''
+
+# The cached views replace get_documents in MEMBERSHIP_BACKEND_UPDATES.py and
+# announcements_list in ANNOUNCEMENTS_REGISTERED_MEMBERS_FIX.py.
+
+# ===== 3. CACHE SETTINGS =====
+CACHE_SETTINGS = '''
+# settings.py - Add these settings
+
+# Every web worker must see the same versions, so use a shared cache.
+# Redis if you have it:
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': 'redis://127.0.0.1:6379/1',
+    }
+}
+# Otherwise the database cache (run: python manage.py createcachetable):
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'response_cache',
+    }
+}
+
+RESPONSE_CACHE_TIMEOUT = 3600  # Seconds; entries expire after this even if nothing changed
+
+ANNOUNCEMENT_FEED_OVERLAP_SECONDS = 5  # ?since= re-sends rows this close to the cursor
+ANNOUNCEMENT_TOMBSTONE_DAYS = 30       # Older cursors get the full list again
+'''
+
+print("RESPONSE CACHE SYSTEM READY!")
+print("Add to your Django backend:")
+print("1. Create response_cache/versions.py from VERSION_FUNCTIONS")
+print("2. Register Announcement and Document in their apps' ready() (VERSIONED_MODELS)")
+print("3. Use the cached get_documents and announcements_list views")
+print("4. Add CACHE_SETTINGS to settings.py")
+print("5. With the database cache run: python manage.py createcachetable")
+print("6. Reload PythonAnywhere web app")
+print("")
+print("Features:")
+print("✅ Documents and announcements served from cache")
+print("✅ Admin edits show up on the next request")
+print("✅ Announcements shown per target audience")
+print("✅ created_by loaded in the same query (no N+1)")
@@ -10,64 +10,76 @@ EMAIL_HOST_PASSWORD = 'your-app-password'
 DEFAULT_FROM_EMAIL = 'Pamoja Kenya MN <noreply@pamojakenyamn.org>'
 
 # Enhanced Views with Email Notifications
-from django.core.mail import send_mail
+# Emails go through the outbox (see EMAIL_OUTBOX_SYSTEM.py) so approvals
+# never wait on SMTP; the worker delivers them in the background.
+from django.db import transaction
+from notifications.outbox import queue_email
+from shares.ledger import append_entries, post_entry
+from shares.models import ShareLedgerEntry
 from django.template.loader import render_to_string
 from django.utils.html import strip_tags
 
 class PaymentViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['post'], permission_classes=[IsAdminUser])
     def approve_payment(self, request, pk=None):
-        payment = self.get_object()
-        payment.status = 'approved'
-        payment.processed_by = request.user
-        payment.admin_notes = request.data.get('notes', '')
-        payment.save()
-        
-        # Handle specific payment types
-        if payment.payment_type == 'activation_fee':
-            # Find and activate application
-            application = Application.objects.filter(
-                user=payment.user, 
-                status__in=['pending', 'payment_submitted']
-            ).first()
+        with transaction.atomic():
+            payment = self.get_object()
+            payment.status = 'approved'
+            payment.processed_by = request.user
+            payment.admin_notes = request.data.get('notes', '')
+            payment.save()
             
-            if application:
-                application.activate_membership()
+            # Handle specific payment types
+            if payment.payment_type == 'activation_fee':
+                # Find and activate application
+                application = Application.objects.filter(
+                    user=payment.user, 
+                    status__in=['pending', 'payment_submitted']
+                ).first()
                 
-        elif payment.payment_type == 'share_purchase':
-            # Handle share purchase approval
-            shares_assigned = int(request.data.get('shares_assigned', payment.amount // 100))
-            
-            # Update user shares
-            profile = payment.user.profile
-            profile.shares_owned += shares_assigned
-            profile.save()
+                if application:
+                    application.activate_membership()
+                    
+            elif payment.payment_type == 'share_purchase':
+                # Handle share purchase approval
+                shares_assigned = int(request.data.get('shares_assigned', payment.amount // 100))
+                
+                # Record the purchase in the share ledger (also updates shares_owned)
+                post_entry(
+                    payment.user,
+                    'purchase',
+                    shares_assigned,
+                    reason='Share purchase payment approved',
+                    created_by=request.user,
+                    reference=f'payment:{payment.id}'
+                )
+                
+                # Create share transaction record
+                ShareTransaction.objects.create(
+                    user=payment.user,
+                    amount=shares_assigned,
+                    transaction_type='purchase',
+                    description=f'Share purchase approved - {shares_assigned} shares',
+                    admin_user=request.user,
+                    payment=payment
+                )
             
-            # Create share transaction record
-            ShareTransaction.objects.create(
-                user=payment.user,
-                amount=shares_assigned,
-                transaction_type='purchase',
-                description=f'Share purchase approved - {shares_assigned} shares',
-                admin_user=request.user,
-                payment=payment
-            )
-        
-        # Send approval email
-        send_payment_approval_email(payment)
+            # Queue approval email - commits together with the approval
+            send_payment_approval_email(payment)
         
         return Response({'message': 'Payment approved and user notified'})
     
     @action(detail=True, methods=['post'], permission_classes=[IsAdminUser])
     def reject_payment(self, request, pk=None):
-        payment = self.get_object()
-        payment.status = 'rejected'
-        payment.processed_by = request.user
-        payment.admin_notes = request.data.get('notes', 'Payment rejected by admin')
-        payment.save()
-        
-        # Send rejection email
-        send_payment_rejection_email(payment)
+        with transaction.atomic():
+            payment = self.get_object()
+            payment.status = 'rejected'
+            payment.processed_by = request.user
+            payment.admin_notes = request.data.get('notes', 'Payment rejected by admin')
+            payment.save()
+            
+            # Queue rejection email - commits together with the rejection
+            send_payment_rejection_email(payment)
         
         return Response({'message': 'Payment rejected and user notified'})
 
@@ -95,13 +107,11 @@ def send_payment_approval_email(payment):
     html_message = render_to_string('emails/payment_approved.html', context)
     plain_message = strip_tags(html_message)
     
-    send_mail(
+    queue_email(
         subject,
         plain_message,
-        settings.DEFAULT_FROM_EMAIL,
         [payment.user.email],
         html_message=html_message,
-        fail_silently=False,
     )
 
 def send_payment_rejection_email(payment):
@@ -119,16 +129,15 @@ def send_payment_rejection_email(payment):
     html_message = render_to_string('emails/payment_rejected.html', context)
     plain_message = strip_tags(html_message)
     
-    send_mail(
+    queue_email(
         subject,
         plain_message,
-        settings.DEFAULT_FROM_EMAIL,
         [payment.user.email],
         html_message=html_message,
-        fail_silently=False,
     )
 
-def send_share_deduction_email(user, shares_deducted, remaining_shares, reason):
+def share_deduction_email(user, shares_deducted, remaining_shares, reason):
+    """Build the share deduction email as queue_email() arguments"""
     subject = "Share Deduction Notification"
     
     context = {
@@ -143,16 +152,20 @@ def send_share_deduction_email(user, shares_deducted, remaining_shares, reason):
     html_message = render_to_string('emails/share_deduction.html', context)
     plain_message = strip_tags(html_message)
     
-    send_mail(
-        subject,
-        plain_message,
-        settings.DEFAULT_FROM_EMAIL,
-        [user.email],
-        html_message=html_message,
-        fail_silently=False,
-    )
+    return subject, plain_message, [user.email], html_message
+
+def send_share_deduction_email(user, shares_deducted, remaining_shares, reason):
+    queue_email(*share_deduction_email(user, shares_deducted, remaining_shares, reason))
 
 # Enhanced Share Deduction with Email
+# One UPDATE with F(), bulk_create for the ledger rows and queued emails,
+# all in one transaction - no per-user save() or SMTP round trip.
+import time
+from django.db.models import F
+from notifications.outbox import queue_emails
+
+DEDUCTION_BATCH_SIZE = 1000  # Payment/EmailOutbox rows per INSERT
+
 @action(detail=False, methods=['post'], permission_classes=[IsAdminUser])
 def deduct_shares_all(self, request):
     try:
@@ -161,38 +174,81 @@ def deduct_shares_all(self, request):
         
         if amount <= 0:
             return Response({'error': 'Amount must be greater than 0'}, status=400)
+        if amount != int(amount):
+            return Response({'error': 'Amount must be a whole number of shares'}, status=400)
+        amount = int(amount)
+        
+        started = time.monotonic()
         
-        users_updated = 0
-        for user in User.objects.filter(profile__shares_owned__gte=amount):
-            old_shares = user.profile.shares_owned
-            user.profile.shares_owned -= amount
-            user.profile.save()
+        with transaction.atomic():
+            # Lock the affected profiles; their old balances drive the ledger and emails
+            profiles = list(
+                UserProfile.objects.select_for_update()
+                .filter(shares_owned__gte=amount)
+                .select_related('user')
+                .only('id', 'shares_owned', 'user__id', 'user__email', 'user__username',
+                      'user__first_name', 'user__last_name')
+            )
+            users_skipped = UserProfile.objects.filter(shares_owned__gt=0, shares_owned__lt=amount).count()
             
-            # Create deduction record
-            Payment.objects.create(
-                user=user,
-                payment_type='share_deduction',
-                amount=-amount,
-                payment_method='system',
-                status='completed',
-                description=f'Share deduction: {reason}',
-                admin_notes=reason,
-                processed_by=request.user
+            # One UPDATE of exactly the locked rows, so the ledger and emails match it
+            users_updated = UserProfile.objects.filter(
+                pk__in=[profile.pk for profile in profiles]
+            ).update(shares_owned=F('shares_owned') - amount)
+            
+            # Create deduction records in chunks, one reference per member
+            reference_prefix = f"PAY{timezone.now().strftime('%Y%m%d%H%M%S')}"
+            Payment.objects.bulk_create(
+                (
+                    Payment(
+                        user=profile.user,
+                        payment_type='share_deduction',
+                        amount=-amount,
+                        payment_method='system',
+                        status='completed',
+                        reference_id=f'{reference_prefix}-{profile.user_id}',
+                        description=f'Share deduction: {reason}',
+                        admin_notes=reason,
+                        processed_by=request.user
+                    )
+                    for profile in profiles
+                ),
+                batch_size=DEDUCTION_BATCH_SIZE
             )
             
-            # Send email notification
-            send_share_deduction_email(
-                user, 
-                amount, 
-                user.profile.shares_owned, 
-                reason
+            # Matching share ledger entries; also queues the dashboard rebuilds
+            append_entries(
+                (
+                    ShareLedgerEntry(
+                        user_id=profile.user_id,
+                        entry_type='deduction',
+                        shares=-amount,
+                        reason=reason,
+                        reference='deduct_shares_all',
+                        created_by=request.user
+                    )
+                    for profile in profiles
+                ),
+                batch_size=DEDUCTION_BATCH_SIZE
             )
             
-            users_updated += 1
+            # Queue email notifications - the outbox worker delivers them
+            emails_queued = queue_emails(
+                (
+                    share_deduction_email(profile.user, amount, profile.shares_owned - amount, reason)
+                    for profile in profiles
+                ),
+                batch_size=DEDUCTION_BATCH_SIZE
+            )
         
         return Response({
-            'message': f'Deducted {amount} shares from {users_updated} users. Email notifications sent.',
-            'users_updated': users_updated
+            'message': f'Deducted {amount} shares from {users_updated} users. Email notifications queued.',
+            'users_updated': users_updated,
+            'users_skipped': users_skipped,
+            'total_shares_deducted': amount * users_updated,
+            'ledger_rows_created': len(profiles),
+            'emails_queued': emails_queued,
+            'duration_seconds': round(time.monotonic() - started, 3)
         })
         
     except Exception as e:
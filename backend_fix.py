@@ -1,5 +1,16 @@
 # Backend Fix for admin_panel/views.py
 # Replace the deduct_shares_all method with this corrected version:
+# The deduction is a single UPDATE with F() and the ledger rows are written
+# with bulk_create, all in one transaction.
+
+import time
+
+from django.db import transaction
+from django.db.models import F
+
+from users.snapshots import invalidate_dashboard
+
+DEDUCTION_BATCH_SIZE = 1000  # ShareTransaction rows per INSERT
 
 @action(detail=False, methods=['post'], permission_classes=[IsAdminUser])
 def deduct_shares_all(self, request):
@@ -19,31 +30,50 @@ def deduct_shares_all(self, request):
         
         reason = request.data.get('reason', 'Admin deduction')
         
-        # Get all users with shares > 0
-        users_with_shares = User.objects.filter(shares_owned__gt=0)
-        
-        if not users_with_shares.exists():
-            return Response({'error': 'No users with shares found'}, status=status.HTTP_400_BAD_REQUEST)
+        started = time.monotonic()
         
-        updated_count = 0
-        for user in users_with_shares:
-            if user.shares_owned >= amount:
-                user.shares_owned -= amount
-                user.save()
-                updated_count += 1
-                
-                # Log the deduction
-                ShareTransaction.objects.create(
-                    user=user,
-                    amount=-amount,
-                    transaction_type='deduction',
-                    description=f'Admin deduction: {reason}',
-                    admin_user=request.user
-                )
+        with transaction.atomic():
+            # Lock the affected rows so the ledger matches exactly who was deducted
+            deducted_ids = list(
+                User.objects.select_for_update()
+                .filter(shares_owned__gte=amount)
+                .values_list('id', flat=True)
+            )
+            users_skipped = User.objects.filter(shares_owned__gt=0, shares_owned__lt=amount).count()
+            
+            if not deducted_ids and not users_skipped:
+                return Response({'error': 'No users with shares found'}, status=status.HTTP_400_BAD_REQUEST)
+            
+            # One UPDATE of exactly the locked rows, so the ledger matches it
+            updated_count = User.objects.filter(
+                pk__in=deducted_ids
+            ).update(shares_owned=F('shares_owned') - amount)
+            
+            # Log the deductions in chunks
+            ShareTransaction.objects.bulk_create(
+                (
+                    ShareTransaction(
+                        user_id=user_id,
+                        amount=-amount,
+                        transaction_type='deduction',
+                        description=f'Admin deduction: {reason}',
+                        admin_user=request.user
+                    )
+                    for user_id in deducted_ids
+                ),
+                batch_size=DEDUCTION_BATCH_SIZE
+            )
+            
+            # update() and bulk_create() send no signals
+            invalidate_dashboard(deducted_ids)
         
         return Response({
             'message': f'Successfully deducted {amount} shares from {updated_count} users',
-            'users_updated': updated_count
+            'users_updated': updated_count,
+            'users_skipped': users_skipped,
+            'total_shares_deducted': amount * updated_count,
+            'ledger_rows_created': len(deducted_ids),
+            'duration_seconds': round(time.monotonic() - started, 3)
         }, status=status.HTTP_200_OK)
         
     except Exception as e:
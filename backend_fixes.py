@@ -90,16 +90,27 @@ class SharePurchaseViewSet(viewsets.ModelViewSet):
             return Response({'error': str(e)}, status=400)
 
 # 4. Remove login restrictions - Update AuthViewSet
+# users/views.py - also needs these imports (sections 11 and 12)
+from users.authentication import principal_values, token_cache
+from users.hashing import PasswordHashingBusy, password_busy_response
+
 class AuthViewSet(viewsets.ViewSet):
     @action(detail=False, methods=['post'])
     def login(self, request):
         username = request.data.get('username')
         password = request.data.get('password')
         
-        user = authenticate(username=username, password=password)
+        try:
+            # Password check runs on the bounded hashing pool (section 12)
+            user = authenticate(username=username, password=password)
+        except PasswordHashingBusy:
+            return password_busy_response()
         if user:
             # Remove is_active check - allow all registered users to login
             token, created = Token.objects.get_or_create(user=user)
+            # Warm the token cache (section 11) so the next request needs no queries
+            token_cache.put(token.key, principal_values(user))
+            shares_owned = UserProfile.objects.filter(user=user).values_list('shares_owned', flat=True).first()
             return Response({
                 'token': token.key,
                 'user': {
@@ -110,10 +121,18 @@ class AuthViewSet(viewsets.ViewSet):
                     'last_name': user.last_name,
                     'is_staff': user.is_staff,
                     'is_active': user.is_active,
-                    'shares_owned': getattr(user.profile, 'shares_owned', 0) if hasattr(user, 'profile') else 0
+                    'shares_owned': shares_owned or 0
                 }
             })
         return Response({'error': 'Invalid credentials'}, status=400)
+    
+    @action(detail=False, methods=['post'], permission_classes=[IsAuthenticated])
+    def logout(self, request):
+        # request.auth is None under SessionAuthentication: no token to delete
+        if request.auth is not None:
+            # Deleting the token also drops it from every process's token cache
+            Token.objects.filter(key=request.auth.key).delete()
+        return Response({'success': True, 'message': 'Logged out successfully'})
 
 # 5. Enhanced Document Model with file viewing
 class Document(models.Model):
@@ -126,6 +145,11 @@ class Document(models.Model):
     admin_notes = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     
+    # Derivatives, stored next to the original (see section 10)
+    thumbnail = models.ImageField(upload_to='documents/', blank=True)
+    preview = models.ImageField(upload_to='documents/', blank=True)
+    derived_from = models.CharField(max_length=255, blank=True)  # file.name the derivatives were made from
+    
     @property
     def file_url(self):
         if self.file:
@@ -137,6 +161,22 @@ class Document(models.Model):
         if self.file:
             return self.file.name.lower().endswith(('.png', '.jpg', '.jpeg', '.gif', '.bmp'))
         return False
+    
+    @property
+    def is_pdf(self):
+        return bool(self.file) and self.file.name.lower().endswith('.pdf')
+    
+    @property
+    def thumbnail_url(self):
+        if self.thumbnail:
+            return self.thumbnail.url
+        return None
+    
+    @property
+    def preview_url(self):
+        if self.preview:
+            return self.preview.url
+        return None
 
 # 6. Payment Details Configuration
 PAYMENT_DETAILS = {
@@ -180,12 +220,15 @@ class DocumentSerializer(serializers.ModelSerializer):
     user_email = serializers.CharField(source='user.email', read_only=True)
     file_url = serializers.CharField(read_only=True)
     is_image = serializers.BooleanField(read_only=True)
+    thumbnail_url = serializers.CharField(read_only=True)
+    preview_url = serializers.CharField(read_only=True)
     
     class Meta:
         model = Document
         fields = [
             'id', 'user', 'user_name', 'user_email', 'name', 'file', 
-            'file_url', 'is_image', 'document_type', 'description', 
+            'file_url', 'is_image', 'thumbnail_url', 'preview_url',
+            'document_type', 'description', 
             'status', 'admin_notes', 'created_at'
         ]
 
@@ -201,4 +244,422 @@ from django.conf.urls.static import static
 
 urlpatterns = [
     # ... your URLs
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+
+# 10. Document thumbnails and previews
+# Made once per upload, after the upload commits, and saved next to the
+# original: documents/id_scan.jpg -> documents/id_scan.thumb.jpg and
+# documents/id_scan.preview.jpg (PDFs get documents/form.preview.png from the
+# first page). Admin lists show thumbnail_url instead of the original file.
+# Pillow is required; PDF previews also need PyMuPDF (pip install pymupdf).
+import io
+import logging
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from PIL import Image, ImageOps
+
+try:
+    import fitz  # PyMuPDF
+except ImportError:
+    fitz = None
+
+logger = logging.getLogger(__name__)
+
+# Corrupt or hostile uploads: UnidentifiedImageError is an OSError, PyMuPDF
+# raises RuntimeError subclasses, and Pillow refuses decompression bombs
+DERIVATIVE_ERRORS = (OSError, ValueError, RuntimeError, Image.DecompressionBombError)
+
+def thumbnail_size():
+    return getattr(settings, 'DOCUMENT_THUMBNAIL_SIZE', (240, 240))
+
+def preview_size():
+    return getattr(settings, 'DOCUMENT_PREVIEW_SIZE', (1024, 1024))
+
+def derivative_name(name, suffix):
+    return f"{os.path.splitext(name)[0]}.{suffix}"
+
+def save_image(image, name, image_format):
+    buffer = io.BytesIO()
+    if image_format == 'JPEG':
+        image = image.convert('RGB')
+        image.save(buffer, 'JPEG', quality=80, optimize=True)
+    else:
+        image.save(buffer, image_format, optimize=True)
+    if default_storage.exists(name):
+        default_storage.delete(name)
+    return default_storage.save(name, ContentFile(buffer.getvalue()))
+
+def sized_copy(image, size):
+    copy = image.copy()
+    copy.thumbnail(size)
+    return copy
+
+def open_source_image(document):
+    """The upload as a PIL image (first page for PDFs), or None if unsupported"""
+    if document.is_image:
+        with document.file.open('rb') as f:
+            image = Image.open(f)
+            image.draft('RGB', preview_size())  # Decode big JPEGs at reduced size
+            image.load()
+            return ImageOps.exif_transpose(image)  # Phone photos come rotated
+
+    if document.is_pdf and fitz is not None:
+        with document.file.open('rb') as f:
+            pdf = fitz.open(stream=f.read(), filetype='pdf')
+        if pdf.page_count == 0:
+            return None
+        page = pdf.load_page(0)
+        # Fit both sides, so a tall narrow page can't render an enormous pixmap
+        width, height = preview_size()
+        zoom = min(width / page.rect.width, height / page.rect.height)
+        pixmap = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+        return Image.frombytes('RGB', (pixmap.width, pixmap.height), pixmap.samples)
+
+    return None
+
+def build_document_derivatives(document_id):
+    """Make the thumbnail and preview for a document unless they are current"""
+    document = Document.objects.filter(id=document_id).first()
+    if document is None or not document.file or document.derived_from == document.file.name:
+        return False
+
+    try:
+        image = open_source_image(document)
+        if image is None:
+            Document.objects.filter(id=document.id).update(derived_from=document.file.name)
+            return False
+
+        preview_format, preview_ext = ('PNG', 'png') if document.is_pdf else ('JPEG', 'jpg')
+        thumbnail = save_image(sized_copy(image, thumbnail_size()),
+                               derivative_name(document.file.name, 'thumb.jpg'), 'JPEG')
+        preview = save_image(sized_copy(image, preview_size()),
+                             derivative_name(document.file.name, f'preview.{preview_ext}'), preview_format)
+    except DERIVATIVE_ERRORS:
+        # The document is already saved; mark it so later saves don't retry the same file
+        logger.exception('Could not build derivatives for document %s', document.id)
+        Document.objects.filter(id=document.id).update(derived_from=document.file.name)
+        return False
+
+    # update() so saving the derivatives doesn't fire post_save again
+    Document.objects.filter(id=document.id).update(
+        thumbnail=thumbnail, preview=preview, derived_from=document.file.name
+    )
+    return True
+
+@receiver(post_save, sender=Document)
+def queue_document_derivatives(sender, instance, **kwargs):
+    if instance.file and instance.derived_from != instance.file.name:
+        transaction.on_commit(lambda: build_document_derivatives(instance.id))
+
+# Backfill existing uploads:
+# documents/management/commands/build_document_derivatives.py
+from django.core.management.base import BaseCommand
+
+class Command(BaseCommand):
+    help = 'Create missing document thumbnails and previews'
+    
+    def handle(self, *args, **options):
+        built = 0
+        pending = Document.objects.exclude(file='').values_list('id', flat=True)
+        for document_id in pending.iterator():
+            if build_document_derivatives(document_id):
+                built += 1
+        self.stdout.write(self.style.SUCCESS(f'Built derivatives for {built} documents'))
+
+# Add to settings.py
+DOCUMENT_THUMBNAIL_SIZE = (240, 240)   # Admin list thumbnails
+DOCUMENT_PREVIEW_SIZE = (1024, 1024)   # Viewer previews and PDF first pages
+
+# 11. Cached token authentication
+# users/authentication.py - DRF's TokenAuthentication reads the Token and its
+# User for every request. CachedTokenAuthentication keeps the user's fields
+# for each token in a per-process LRU for TOKEN_AUTH_CACHE_TTL seconds, so
+# repeat requests from a signed-in member skip the database. request.user is
+# a User built from PRINCIPAL_FIELDS; any other field loads on first access.
+# Both "Token <key>" and the "Bearer <key>" header the frontend sends work.
+#
+# Deleting a token (logout) or saving/deleting its user (password change,
+# deactivation, is_staff) drops the entry in this process after commit and
+# bumps a counter in the shared cache. Other processes check the counter
+# every TOKEN_AUTH_SYNC_SECONDS and clear their LRU when it has moved. With a
+# per-process cache (locmem, dummy) they can't see the counter, so entries are
+# then kept no longer than TOKEN_AUTH_SYNC_SECONDS instead.
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import cache
+from django.db.models.signals import post_delete
+from rest_framework.authentication import TokenAuthentication, get_authorization_header
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+
+# In User's field order - from_db() needs them that way
+PRINCIPAL_FIELDS = ['id', 'is_superuser', 'username', 'first_name', 'last_name',
+                    'email', 'is_staff', 'is_active', 'date_joined']
+TOKEN_GENERATION_KEY = 'token-auth:generation'
+# Backends whose contents other processes can't see
+LOCAL_CACHE_BACKENDS = {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+}
+
+def shared_cache_configured():
+    backend = getattr(settings, 'CACHES', {}).get('default', {}).get(
+        'BACKEND', 'django.core.cache.backends.locmem.LocMemCache'
+    )
+    return backend not in LOCAL_CACHE_BACKENDS
+
+class TokenCache:
+    """LRU of token key -> PRINCIPAL_FIELDS values, each kept for ttl seconds"""
+    
+    def __init__(self):
+        self.size = getattr(settings, 'TOKEN_AUTH_CACHE_SIZE', 10000)
+        self.ttl = getattr(settings, 'TOKEN_AUTH_CACHE_TTL', 300)
+        self.sync_interval = getattr(settings, 'TOKEN_AUTH_SYNC_SECONDS', 5)
+        if not shared_cache_configured():
+            # Revocations in other processes never reach this one; let entries expire instead
+            self.ttl = min(self.ttl, self.sync_interval)
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.generation = None
+        self.synced_at = 0
+    
+    def get(self, key):
+        self.sync()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            values, expires_at = entry
+            if expires_at < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return values
+    
+    def put(self, key, values):
+        with self.lock:
+            self.entries[key] = (values, time.monotonic() + self.ttl)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+    
+    def evict_token(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+    
+    def evict_user(self, user_id):
+        with self.lock:
+            for key in [key for key, (values, _) in self.entries.items() if values[0] == user_id]:
+                del self.entries[key]
+    
+    def sync(self):
+        # One shared cache read per process every sync_interval, not per request
+        now = time.monotonic()
+        if now - self.synced_at < self.sync_interval:
+            return
+        self.synced_at = now
+        generation = cache.get(TOKEN_GENERATION_KEY)
+        if generation != self.generation:
+            with self.lock:
+                self.entries.clear()
+                self.generation = generation
+
+token_cache = TokenCache()
+
+def principal_values(user):
+    return tuple(getattr(user, field) for field in PRINCIPAL_FIELDS)
+
+def principal(values):
+    """A User with PRINCIPAL_FIELDS loaded; the rest are deferred, so save() can't blank them"""
+    return User.from_db('default', PRINCIPAL_FIELDS, values)
+
+class CachedTokenAuthentication(TokenAuthentication):
+    keywords = (b'token', b'bearer')
+    
+    def authenticate(self, request):
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() not in self.keywords:
+            return None
+        if len(auth) != 2:
+            raise AuthenticationFailed('Invalid token header.')
+        try:
+            key = auth[1].decode()
+        except UnicodeError:
+            raise AuthenticationFailed('Invalid token header.')
+        return self.authenticate_credentials(key)
+    
+    def authenticate_credentials(self, key):
+        values = token_cache.get(key)
+        if values is None:
+            # Token and user in one query
+            values = Token.objects.filter(key=key).values_list(
+                *[f'user__{field}' for field in PRINCIPAL_FIELDS]
+            ).first()
+            if values is None:
+                raise AuthenticationFailed('Invalid token.')
+            token_cache.put(key, values)
+        
+        user = principal(values)
+        if not user.is_active:
+            raise AuthenticationFailed('User inactive or deleted.')
+        return (user, Token(key=key, user=user))
+
+def publish_revocation():
+    # add() is a no-op when the key exists, so concurrent revocations all count
+    cache.add(TOKEN_GENERATION_KEY, 0, None)
+    try:
+        cache.incr(TOKEN_GENERATION_KEY)
+    except ValueError:  # Evicted between add() and incr()
+        cache.set(TOKEN_GENERATION_KEY, 1, None)
+
+def token_deleted(sender, instance, **kwargs):
+    def revoke():
+        token_cache.evict_token(instance.key)
+        publish_revocation()
+    transaction.on_commit(revoke)
+
+def token_user_changed(sender, instance, update_fields=None, **kwargs):
+    # Logins that only touch last_login don't change the principal
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    def revoke():
+        token_cache.evict_user(instance.id)
+        publish_revocation()
+    transaction.on_commit(revoke)
+
+def connect_token_cache_signals():
+    # From UsersConfig.ready(), so every process publishes changes from the start
+    post_delete.connect(token_deleted, sender=Token, weak=False)
+    post_save.connect(token_user_changed, sender=User, weak=False)
+    post_delete.connect(token_user_changed, sender=User, weak=False)
+
+# Add to settings.py. Revocations reach other processes through the shared
+# CACHES from RESPONSE_CACHE_SYSTEM.py (Redis or DatabaseCache). Without it the
+# cache TTL is capped at TOKEN_AUTH_SYNC_SECONDS.
+REST_FRAMEWORK = {
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'users.authentication.CachedTokenAuthentication',
+        'rest_framework.authentication.SessionAuthentication',
+    ],
+}
+TOKEN_AUTH_CACHE_SIZE = 10000   # Tokens kept per process
+TOKEN_AUTH_CACHE_TTL = 300      # Seconds before a cached token is read again
+TOKEN_AUTH_SYNC_SECONDS = 5     # How soon other processes see a revocation
+
+# 12. Bounded password hashing
+# users/hashing.py - PBKDF2 takes tens of milliseconds of CPU per check, and a
+# login rush used to run one check per request thread and starve every other
+# endpoint. Hashing now runs on PASSWORD_HASH_WORKERS pool threads
+# (hashlib releases the GIL, so they use real cores) with at most
+# PASSWORD_HASH_QUEUE checks waiting. Past that, PasswordHashingBusy is
+# raised at once and the views answer 429 with Retry-After.
+#
+# BoundedModelBackend replaces ModelBackend, so every authenticate() call
+# goes through the pool. When a stored hash needs upgrading (more iterations,
+# new hasher) the login succeeds straight away and the re-hash runs on the
+# pool afterwards, or at the next login if the pool is busy.
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import check_password, make_password
+from django.db import close_old_connections
+from django.http import JsonResponse
+
+class PasswordHashingBusy(Exception):
+    pass
+
+class PasswordHashPool:
+    def __init__(self):
+        self.workers = getattr(settings, 'PASSWORD_HASH_WORKERS', 2)
+        self.capacity = self.workers + getattr(settings, 'PASSWORD_HASH_QUEUE', 8)
+        self.lock = threading.Lock()
+        self.executor = None
+        self.slots = None
+        self.pid = None
+    
+    def ensure_started(self):
+        # Start lazily and again after a fork, since threads do not survive it
+        if self.pid == os.getpid():
+            return
+        with self.lock:
+            if self.pid != os.getpid():
+                self.executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                   thread_name_prefix='password-hash')
+                self.slots = threading.BoundedSemaphore(self.capacity)
+                self.pid = os.getpid()
+    
+    def submit(self, fn, *args):
+        """Future for fn(*args), or None when the workers and queue are all taken"""
+        self.ensure_started()
+        if not self.slots.acquire(blocking=False):
+            return None
+        try:
+            future = self.executor.submit(fn, *args)
+        except Exception:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda future: self.slots.release())
+        return future
+    
+    def run(self, fn, *args):
+        """fn(*args) on a pool thread; the request thread waits for the result"""
+        future = self.submit(fn, *args)
+        if future is None:
+            raise PasswordHashingBusy()
+        return future.result()
+
+hash_pool = PasswordHashPool()
+
+def hash_password(raw_password):
+    return hash_pool.run(make_password, raw_password)
+
+def upgrade_password_hash(user_id, old_encoded, raw_password):
+    # Pool threads keep their own DB connection; recycle it like a request would
+    close_old_connections()
+    try:
+        # Conditional update: skipped if the password changed in the meantime
+        User.objects.filter(id=user_id, password=old_encoded).update(password=make_password(raw_password))
+    finally:
+        close_old_connections()
+
+class BoundedModelBackend(ModelBackend):
+    """ModelBackend with hashing on hash_pool and hash upgrades after the login"""
+    
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = User._default_manager.get_by_natural_key(username)
+        except User.DoesNotExist:
+            # Hash anyway so the response time doesn't reveal which usernames exist
+            hash_pool.run(make_password, password)
+            return None
+        
+        needs_upgrade = []
+        if not hash_pool.run(check_password, password, user.password, needs_upgrade.append):
+            return None
+        if needs_upgrade:
+            hash_pool.submit(upgrade_password_hash, user.id, user.password, password)
+        return user if self.user_can_authenticate(user) else None
+
+def password_busy_response():
+    retry_after = getattr(settings, 'PASSWORD_HASH_RETRY_AFTER', 2)
+    response = JsonResponse({'error': 'Too many sign-ins right now, please try again in a moment'},
+                            status=429)
+    response['Retry-After'] = str(retry_after)
+    return response
+
+# Add to settings.py
+AUTHENTICATION_BACKENDS = ['users.hashing.BoundedModelBackend']
+PASSWORD_HASH_WORKERS = 2      # Cores given to password hashing per process
+PASSWORD_HASH_QUEUE = 8        # Checks allowed to wait; more get a 429
+PASSWORD_HASH_RETRY_AFTER = 2  # Seconds, sent in Retry-After
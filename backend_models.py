@@ -44,7 +44,9 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from django.db import transaction
 from django.utils import timezone
+from shares.ledger import post_entry
 
 class SharePurchaseViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
@@ -63,18 +65,24 @@ class SharePurchaseViewSet(viewsets.ModelViewSet):
         shares_assigned = request.data.get('shares_assigned', share_purchase.shares_requested)
         admin_notes = request.data.get('admin_notes', '')
         
-        # Update share purchase
-        share_purchase.status = 'approved'
-        share_purchase.shares_assigned = shares_assigned
-        share_purchase.admin_notes = admin_notes
-        share_purchase.reviewed_by = request.user
-        share_purchase.reviewed_at = timezone.now()
-        share_purchase.save()
-        
-        # Update user's total shares
-        user_profile = share_purchase.user.profile  # Assuming you have a UserProfile model
-        user_profile.shares_owned += int(shares_assigned)
-        user_profile.save()
+        with transaction.atomic():
+            # Update share purchase
+            share_purchase.status = 'approved'
+            share_purchase.shares_assigned = shares_assigned
+            share_purchase.admin_notes = admin_notes
+            share_purchase.reviewed_by = request.user
+            share_purchase.reviewed_at = timezone.now()
+            share_purchase.save()
+            
+            # Record the purchase in the share ledger (also updates shares_owned)
+            post_entry(
+                share_purchase.user,
+                'purchase',
+                int(shares_assigned),
+                reason='Approved share purchase',
+                created_by=request.user,
+                reference=f'share_purchase:{share_purchase.id}'
+            )
         
         return Response({'message': 'Share purchase approved successfully'})
     
@@ -2,8 +2,14 @@
 
 from django.db import models
 from django.contrib.auth.models import User
-from django.core.mail import send_mail
+from django.db import transaction
+from django.db.models import Avg, Case, Count, Max, Q, Sum, When
+from django.db.models.functions import TruncDate, TruncMonth
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from notifications.outbox import queue_email
 from django.conf import settings
+from datetime import timedelta
 from decimal import Decimal
 
 class Payment(models.Model):
@@ -16,6 +22,10 @@ class Payment(models.Model):
         ('refund', 'Refund'),
     ]
     
+    # Used by financial_report to split totals into money in and money out
+    INCOME_TYPES = ['activation_fee', 'share_purchase', 'membership_fee']
+    PAYOUT_TYPES = ['claim_payout', 'refund']
+    
     PAYMENT_METHODS = [
         ('paypal', 'PayPal'),
         ('mpesa', 'M-Pesa'),
@@ -52,6 +62,10 @@ class Payment(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),  # financial_report date ranges
+            models.Index(fields=['updated_at']),  # incremental rollup refresh
+        ]
     
     def save(self, *args, **kwargs):
         if not self.reference_id:
@@ -84,13 +98,7 @@ class Payment(models.Model):
         Pamoja Kenya MN Team
         """
         
-        send_mail(
-            subject,
-            message,
-            settings.DEFAULT_FROM_EMAIL,
-            [self.user.email],
-            fail_silently=False,
-        )
+        queue_email(subject, message, [self.user.email])
 
 # Enhanced Application Model
 class Application(models.Model):
@@ -144,19 +152,99 @@ class Application(models.Model):
         Pamoja Kenya MN Team
         """
         
-        send_mail(
-            subject,
-            message,
-            settings.DEFAULT_FROM_EMAIL,
-            [self.user.email],
-            fail_silently=False,
-        )
+        queue_email(subject, message, [self.user.email])
+
+# Daily payment rollups for long-range financial reports
+class PaymentDailyRollup(models.Model):
+    """Approved payment totals per day and payment type"""
+    date = models.DateField()
+    payment_type = models.CharField(max_length=20, choices=Payment.PAYMENT_TYPES)
+    total = models.DecimalField(max_digits=14, decimal_places=2)
+    count = models.PositiveIntegerField()
+    refreshed_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        unique_together = ['date', 'payment_type']
+        ordering = ['date', 'payment_type']
+    
+    def __str__(self):
+        return f"{self.date} {self.payment_type}: {self.total} ({self.count})"
+
+class PaymentRollupState(models.Model):
+    """Single row (id=1): when rollups were last refreshed, and the lock refreshes take"""
+    refreshed_at = models.DateTimeField(null=True, blank=True)
+    
+    def __str__(self):
+        return f"Payment rollups refreshed at {self.refreshed_at}"
+
+def refresh_payment_rollups(full=False):
+    """Recompute rollup rows for every day touched since the last refresh.
+    
+    A day is recomputed when any payment created on it was saved since the
+    previous refresh (new payments, approvals, rejections, edits). Deleted
+    payments, and payments changed with QuerySet.update() (which leaves
+    updated_at alone), are only picked up by refresh_payment_rollups(full=True).
+    Refreshes are serialized on the PaymentRollupState row, so concurrent
+    callers (financial_report runs this on GET) wait instead of colliding on
+    the (date, payment_type) unique constraint. Returns the days refreshed.
+    """
+    PaymentRollupState.objects.get_or_create(id=1)
+    
+    with transaction.atomic():
+        state = PaymentRollupState.objects.select_for_update().get(id=1)
+        refreshed_at = timezone.now()
+        
+        approved = Payment.objects.filter(status='approved')
+        days = None
+        if not full and state.refreshed_at is not None:
+            # Overlap, so a save committed just after the previous refresh read is not missed
+            overlap = getattr(settings, 'PAYMENT_ROLLUP_OVERLAP_SECONDS', 60)
+            watermark = state.refreshed_at - timedelta(seconds=overlap)
+            days = list(
+                Payment.objects.filter(updated_at__gte=watermark)
+                .annotate(day=TruncDate('created_at'))
+                .order_by()
+                .values_list('day', flat=True)
+                .distinct()
+            )
+            approved = approved.filter(created_at__date__in=days)
+        
+        if days != []:
+            totals = (
+                approved.annotate(day=TruncDate('created_at'))
+                .values('day', 'payment_type')
+                .annotate(day_total=Sum('amount'), day_count=Count('id'))
+                .order_by()
+            )
+            rollups = [
+                PaymentDailyRollup(
+                    date=row['day'],
+                    payment_type=row['payment_type'],
+                    total=row['day_total'],
+                    count=row['day_count'],
+                    refreshed_at=refreshed_at,
+                )
+                for row in totals
+            ]
+            
+            stale = PaymentDailyRollup.objects.all()
+            if days is not None:
+                stale = stale.filter(date__in=days)
+            stale.delete()
+            PaymentDailyRollup.objects.bulk_create(rollups, batch_size=500)
+        
+        # Moves even when no day changed or a day has no approved payments left
+        PaymentRollupState.objects.filter(id=1).update(refreshed_at=refreshed_at)
+    
+    if days is None:
+        return len({rollup.date for rollup in rollups})
+    return len(days)
 
 # Enhanced Views
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.utils import timezone
+from admin_panel.pagination import InvalidCursor, decode_cursor, encode_cursor, get_page_size
 
 class PaymentViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
@@ -166,100 +254,222 @@ class PaymentViewSet(viewsets.ModelViewSet):
     
     @action(detail=True, methods=['post'], permission_classes=[IsAdminUser])
     def approve_payment(self, request, pk=None):
-        payment = self.get_object()
-        payment.status = 'approved'
-        payment.processed_by = request.user
-        payment.admin_notes = request.data.get('notes', '')
-        payment.save()
-        
-        # Handle specific payment types
-        if payment.payment_type == 'activation_fee' and payment.application:
-            payment.application.activate_membership()
-        elif payment.payment_type == 'share_purchase' and payment.share_purchase:
-            shares_assigned = request.data.get('shares_assigned', payment.share_purchase.shares_requested)
-            payment.share_purchase.approve_purchase(shares_assigned, request.user)
-        
-        # Send notification email
-        payment.send_notification_email()
+        with transaction.atomic():
+            payment = self.get_object()
+            payment.status = 'approved'
+            payment.processed_by = request.user
+            payment.admin_notes = request.data.get('notes', '')
+            payment.save()
+            
+            # Handle specific payment types
+            if payment.payment_type == 'activation_fee' and payment.application:
+                payment.application.activate_membership()
+            elif payment.payment_type == 'share_purchase' and payment.share_purchase:
+                shares_assigned = request.data.get('shares_assigned', payment.share_purchase.shares_requested)
+                payment.share_purchase.approve_purchase(shares_assigned, request.user)
+            
+            # Queue notification email - the outbox worker sends it
+            payment.send_notification_email()
         
         return Response({'message': 'Payment approved successfully'})
     
     @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
     def financial_report(self, request):
-        """Generate financial report"""
-        from django.db.models import Sum, Count
+        """Generate financial report
         
-        # Get date range
+        By-type totals come from one GROUP BY and the monthly summary from one
+        TruncMonth GROUP BY. With ?use_rollups=true (or the
+        FINANCIAL_REPORT_USE_ROLLUPS setting) both read PaymentDailyRollup rows,
+        refreshed incrementally first, instead of scanning payments.
+        """
+        # Get date range (inclusive, YYYY-MM-DD)
         start_date = request.query_params.get('start_date')
         end_date = request.query_params.get('end_date')
+        try:
+            start = parse_date(start_date) if start_date else None
+            end = parse_date(end_date) if end_date else None
+        except ValueError:
+            start = end = None
+        if (start_date and start is None) or (end_date and end is None):
+            return Response({'error': 'Dates must be in YYYY-MM-DD format'}, status=400)
         
-        queryset = Payment.objects.filter(status='approved')
-        if start_date:
-            queryset = queryset.filter(created_at__gte=start_date)
-        if end_date:
-            queryset = queryset.filter(created_at__lte=end_date)
+        default_rollups = getattr(settings, 'FINANCIAL_REPORT_USE_ROLLUPS', False)
+        use_rollups = request.query_params.get('use_rollups', str(default_rollups)).lower() == 'true'
         
-        # Calculate totals by payment type
-        report = {
-            'total_income': queryset.filter(
-                payment_type__in=['activation_fee', 'share_purchase', 'membership_fee']
-            ).aggregate(Sum('amount'))['amount__sum'] or 0,
-            
-            'total_payouts': queryset.filter(
-                payment_type__in=['claim_payout', 'refund']
-            ).aggregate(Sum('amount'))['amount__sum'] or 0,
-            
-            'by_type': {},
-            'monthly_summary': []
-        }
+        if use_rollups:
+            refresh_payment_rollups()
+            queryset = PaymentDailyRollup.objects.all()
+            if start:
+                queryset = queryset.filter(date__gte=start)
+            if end:
+                queryset = queryset.filter(date__lte=end)
+            month = TruncMonth('date')
+            amount, count = Sum('total'), Sum('count')
+        else:
+            queryset = Payment.objects.filter(status='approved')
+            if start:
+                queryset = queryset.filter(created_at__date__gte=start)
+            if end:
+                queryset = queryset.filter(created_at__date__lte=end)
+            month = TruncMonth('created_at')
+            amount, count = Sum('amount'), Count('id')
         
-        # Group by payment type
-        for payment_type, _ in Payment.PAYMENT_TYPES:
-            type_data = queryset.filter(payment_type=payment_type).aggregate(
-                total=Sum('amount'),
-                count=Count('id')
+        # Group by payment type - one query
+        by_type = {payment_type: {'total': 0, 'count': 0} for payment_type, _ in Payment.PAYMENT_TYPES}
+        for row in queryset.values('payment_type').annotate(type_total=amount, type_count=count).order_by():
+            by_type[row['payment_type']] = {'total': row['type_total'] or 0, 'count': row['type_count']}
+        
+        # Group by month - one query
+        amount_field = 'total' if use_rollups else 'amount'
+        monthly_rows = (
+            queryset.annotate(month=month)
+            .values('month')
+            .annotate(
+                income=Sum(amount_field, filter=Q(payment_type__in=Payment.INCOME_TYPES)),
+                payouts=Sum(amount_field, filter=Q(payment_type__in=Payment.PAYOUT_TYPES)),
+                month_count=count,
             )
-            report['by_type'][payment_type] = {
-                'total': type_data['total'] or 0,
-                'count': type_data['count']
-            }
+            .order_by('month')
+        )
+        
+        report = {
+            'total_income': sum(by_type[payment_type]['total'] for payment_type in Payment.INCOME_TYPES),
+            'total_payouts': sum(by_type[payment_type]['total'] for payment_type in Payment.PAYOUT_TYPES),
+            'by_type': by_type,
+            'monthly_summary': [{
+                'month': row['month'].strftime('%Y-%m'),
+                'income': row['income'] or 0,
+                'payouts': row['payouts'] or 0,
+                'net': (row['income'] or 0) - (row['payouts'] or 0),
+                'count': row['month_count'],
+            } for row in monthly_rows],
+            'source': 'rollups' if use_rollups else 'payments',
+        }
         
         return Response(report)
     
     @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
     def shares_report(self, request):
-        """Generate shares report"""
-        from django.db.models import Sum
+        """Generate shares report
         
-        total_shares_sold = SharePurchase.objects.filter(
-            status='approved'
-        ).aggregate(Sum('shares_assigned'))['shares_assigned__sum'] or 0
+        Two aggregate queries whatever the number of shareholders: one over
+        approved purchases, one over holders with conditional Count(Case(...))
+        buckets. ?histogram=0,10,20,50,100 adds counts for those bucket edges.
+        The holder list itself is served by the paginated shareholders action.
+        """
+        histogram_edges = None
+        if request.query_params.get('histogram'):
+            try:
+                histogram_edges = parse_histogram_edges(request.query_params['histogram'])
+            except ValueError as e:
+                return Response({'error': str(e)}, status=400)
         
-        total_revenue = SharePurchase.objects.filter(
-            status='approved'
-        ).aggregate(Sum('amount'))['amount__sum'] or 0
+        return Response(build_shares_report(histogram_edges))
+    
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
+    def shareholders(self, request):
+        """Shareholders, largest holdings first, ?cursor= paginated"""
+        page_size = get_page_size(request)
+        holders = User.objects.filter(profile__shares_owned__gt=0)
         
-        # Users with shares
-        users_with_shares = User.objects.filter(
-            profile__shares_owned__gt=0
-        ).values('id', 'first_name', 'last_name', 'email', 'profile__shares_owned')
+        cursor = request.query_params.get('cursor')
+        if cursor:
+            try:
+                shares_owned, user_id = decode_cursor(cursor, parse_key=int)
+            except InvalidCursor:
+                return Response({'error': 'Invalid cursor'}, status=400)
+            holders = holders.filter(
+                Q(profile__shares_owned__lt=shares_owned) |
+                Q(profile__shares_owned=shares_owned, id__gt=user_id)
+            )
         
-        report = {
-            'total_shares_sold': total_shares_sold,
-            'total_revenue': total_revenue,
-            'average_price_per_share': total_revenue / total_shares_sold if total_shares_sold > 0 else 0,
-            'users_with_shares': list(users_with_shares),
-            'share_distribution': {
-                'high_holders': users_with_shares.filter(profile__shares_owned__gte=50).count(),
-                'medium_holders': users_with_shares.filter(
-                    profile__shares_owned__gte=20, 
-                    profile__shares_owned__lt=50
-                ).count(),
-                'low_holders': users_with_shares.filter(profile__shares_owned__lt=20).count(),
-            }
-        }
+        rows = list(
+            holders.order_by('-profile__shares_owned', 'id')
+            .values('id', 'first_name', 'last_name', 'email', 'profile__shares_owned')[:page_size + 1]
+        )
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
         
-        return Response(report)
+        return Response({
+            'shareholders': rows,
+            'page_size': page_size,
+            'has_more': has_more,
+            'next_cursor': encode_cursor(rows[-1]['profile__shares_owned'], rows[-1]['id']) if has_more else None,
+        })
+
+# Shares report helpers
+MAX_HISTOGRAM_EDGES = 20
+
+def build_shares_report(histogram_edges=None):
+    """shares_report body, shared with the background report jobs"""
+    sales = SharePurchase.objects.filter(status='approved').aggregate(
+        total_shares_sold=Sum('shares_assigned'),
+        total_revenue=Sum('amount'),
+    )
+    total_shares_sold = sales['total_shares_sold'] or 0
+    total_revenue = sales['total_revenue'] or 0
+    
+    # Holders, totals and distribution buckets in one query
+    buckets = {
+        'high_holders': Q(shares_owned__gte=50),
+        'medium_holders': Q(shares_owned__gte=20, shares_owned__lt=50),
+        'low_holders': Q(shares_owned__lt=20),
+    }
+    for index, (low, high) in enumerate(histogram_ranges(histogram_edges or [])):
+        buckets[f'bucket_{index}'] = Q(shares_owned__gte=low, shares_owned__lt=high) if high is not None else Q(shares_owned__gte=low)
+    if histogram_edges:
+        buckets['below_range'] = Q(shares_owned__lt=histogram_edges[0])
+    
+    holders = UserProfile.objects.filter(shares_owned__gt=0).aggregate(
+        holder_count=Count('id'),
+        total_shares_held=Sum('shares_owned'),
+        average_shares_held=Avg('shares_owned'),
+        **{name: Count(Case(When(condition, then=1))) for name, condition in buckets.items()}
+    )
+    
+    report = {
+        'total_shares_sold': total_shares_sold,
+        'total_revenue': total_revenue,
+        'average_price_per_share': total_revenue / total_shares_sold if total_shares_sold > 0 else 0,
+        'holder_count': holders['holder_count'],
+        'total_shares_held': holders['total_shares_held'] or 0,
+        'average_shares_held': round(holders['average_shares_held'] or 0, 2),
+        'share_distribution': {
+            'high_holders': holders['high_holders'],
+            'medium_holders': holders['medium_holders'],
+            'low_holders': holders['low_holders'],
+        },
+        'shareholders_url': '/api/admin/payments/shareholders/',
+    }
+    
+    if histogram_edges:
+        report['histogram'] = {
+            'edges': histogram_edges,
+            'below_range': holders['below_range'],
+            'buckets': [{
+                'min': low,
+                'max': high,
+                'holders': holders[f'bucket_{index}'],
+            } for index, (low, high) in enumerate(histogram_ranges(histogram_edges))],
+        }
+    
+    return report
+
+def parse_histogram_edges(value):
+    """'0,10,20,50' -> [0, 10, 20, 50]; edges must be increasing whole numbers"""
+    try:
+        edges = [int(edge) for edge in value.split(',')]
+    except ValueError:
+        raise ValueError('histogram must be a comma-separated list of whole numbers')
+    if len(edges) > MAX_HISTOGRAM_EDGES:
+        raise ValueError(f'histogram accepts at most {MAX_HISTOGRAM_EDGES} edges')
+    if any(low >= high for low, high in zip(edges, edges[1:])):
+        raise ValueError('histogram edges must be in increasing order')
+    return edges
+
+def histogram_ranges(edges):
+    """[0, 10, 50] -> [(0, 10), (10, 50), (50, None)]"""
+    return list(zip(edges, edges[1:] + [None]))
 
 # Email notification for share deductions
 def send_share_deduction_email(user, amount_deducted, remaining_shares, reason):
@@ -282,10 +492,19 @@ def send_share_deduction_email(user, amount_deducted, remaining_shares, reason):
     Pamoja Kenya MN Team
     """
     
-    send_mail(
-        subject,
-        message,
-        settings.DEFAULT_FROM_EMAIL,
-        [user.email],
-        fail_silently=False,
-    )
\ No newline at end of file
+    queue_email(subject, message, [user.email])
+
+# management/commands/refresh_payment_rollups.py
+# Schedule nightly on PythonAnywhere: python manage.py refresh_payment_rollups
+# After deleting, bulk-importing or update()-ing payments: python manage.py refresh_payment_rollups --full
+from django.core.management.base import BaseCommand
+
+class Command(BaseCommand):
+    help = 'Refresh PaymentDailyRollup rows used by financial_report'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Rebuild every day from scratch')
+    
+    def handle(self, *args, **options):
+        days = refresh_payment_rollups(full=options['full'])
+        self.stdout.write(self.style.SUCCESS(f"Refreshed payment rollups for {days} days"))
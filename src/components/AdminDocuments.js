@@ -162,7 +162,17 @@ const AdminDocuments = () => {
                     <small className="d-block text-muted">{doc.user_email}</small>
                   </td>
                   <td>
-                    <i className="bi bi-file-earmark me-2"></i>
+                    {doc.thumbnail_url ? (
+                      <img
+                        src={doc.thumbnail_url}
+                        alt=""
+                        loading="lazy"
+                        className="rounded me-2"
+                        style={{width: '40px', height: '40px', objectFit: 'cover'}}
+                      />
+                    ) : (
+                      <i className="bi bi-file-earmark me-2"></i>
+                    )}
                     {doc.name}
                     {doc.description && <small className="d-block text-muted">{doc.description}</small>}
                   </td>
@@ -35,9 +35,9 @@ const DocumentViewer = ({ document, onClose }) => {
 
             {document.file_url && (
               <div className="text-center">
-                {isImage ? (
+                {isImage || (isPdf && document.preview_url) ? (
                   <img 
-                    src={document.file_url} 
+                    src={document.preview_url || document.file_url} 
                     alt={document.name}
                     className="img-fluid rounded"
                     style={{maxHeight: '400px'}}
@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
 import { useAuth } from '../context/AuthContext';
-import { paymentsAPI, claimsAPI, sharesAPI, documentsAPI, applicationAPI } from '../services/api';
+import { documentsAPI, userAPI } from '../services/api';
 
 const UserDashboard = () => {
   const { user } = useAuth();
@@ -10,7 +10,8 @@ const UserDashboard = () => {
     claims: [],
     shares: [],
     documents: [],
-    applications: []
+    applications: [],
+    totals: {}
   });
   const [loading, setLoading] = useState(true);
 
@@ -20,20 +21,20 @@ const UserDashboard = () => {
 
   const loadDashboardData = async () => {
     try {
-      const [paymentsRes, claimsRes, sharesRes, documentsRes, applicationsRes] = await Promise.all([
-        paymentsAPI.getPayments().catch(() => ({ data: [] })),
-        claimsAPI.getClaims().catch(() => ({ data: [] })),
-        sharesAPI.getShares().catch(() => ({ data: [] })),
-        documentsAPI.getDocuments().catch(() => ({ data: [] })),
-        applicationAPI.getApplications().catch(() => ({ data: [] }))
+      // One request for the lists and totals instead of one per list
+      const [dashboardRes, documentsRes] = await Promise.all([
+        userAPI.getDashboard().catch(() => ({ data: {} })),
+        documentsAPI.getDocuments().catch(() => ({ data: [] }))
       ]);
+      const dashboard = dashboardRes.data;
 
       setStats({
-        payments: paymentsRes.data.payments || paymentsRes.data || [],
-        claims: claimsRes.data.claims || claimsRes.data || [],
-        shares: sharesRes.data.shares || sharesRes.data || [],
+        payments: dashboard.payments || [],
+        claims: dashboard.claims || [],
+        shares: dashboard.shares || [],
         documents: documentsRes.data.documents || documentsRes.data || [],
-        applications: applicationsRes.data.applications || applicationsRes.data || []
+        applications: dashboard.applications || [],
+        totals: dashboard.stats || {}
       });
     } catch (error) {
       console.error('Error loading dashboard data:', error);
@@ -52,8 +53,9 @@ const UserDashboard = () => {
   };
 
   const totalShares = user?.shares || 0;
-  const totalPayments = Array.isArray(stats.payments) ? stats.payments.reduce((sum, p) => sum + parseFloat(p.amount || 0), 0) : 0;
-  const pendingClaims = Array.isArray(stats.claims) ? stats.claims.filter(c => c.status === 'pending').length : 0;
+  // Lists only hold the newest rows, so totals come from the server
+  const totalPayments = parseFloat(stats.totals.total_paid || 0);
+  const pendingClaims = stats.totals.pending_claims || 0;
   const membershipStatus = user?.is_active_member ? 'Active' : 'Inactive';
 
   if (loading) {
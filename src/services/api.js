@@ -28,9 +28,16 @@ api.interceptors.request.use(
   }
 );
 
+// Set after any successful submission so the next dashboard load skips the
+// server's stale snapshot and shows what was just submitted
+let dashboardChanged = false;
+
 // Response interceptor to handle errors
 api.interceptors.response.use(
   (response) => {
+    if (response.config.method !== 'get') {
+      dashboardChanged = true;
+    }
     return response;
   },
   (error) => {
@@ -131,6 +138,8 @@ export const documentsAPI = {
 // Announcements API calls
 export const announcementsAPI = {
   getAnnouncements: () => api.get('/announcements/'),
+  // Changes after a previous response's cursor: { announcements, removed, cursor }
+  getAnnouncementChanges: (cursor) => api.get('/announcements/', { params: { since: cursor } }),
   createAnnouncement: (data) => api.post('/announcements/', data),
   getAnnouncement: (id) => api.get(`/announcements/${id}/`),
   updateAnnouncement: (id, data) => api.put(`/announcements/${id}/`, data),
@@ -162,6 +171,13 @@ export const userAPI = {
   changePassword: (data) => api.post('/auth/change-password/', data),
   getUser: () => api.get('/users/me/'),
   updateUser: (data) => api.put('/users/me/', data),
+  // Newest rows of each list plus stats; next_cursors.<section> pages the rest
+  getDashboard: () => {
+    const params = dashboardChanged ? { consistency: 'strict' } : {};
+    dashboardChanged = false;
+    return api.get('/user/dashboard/', { params });
+  },
+  getDashboardSection: (section, cursor) => api.get('/user/dashboard/', { params: { section, cursor } }),
 };
 
 // Admin API calls
@@ -181,7 +197,7 @@ export const adminAPI = {
   getRegisteredUsers: () => api.get('/admin/users/registered_users/'),
   
   // Applications management
-  getApplications: () => api.get('/admin/applications/'),
+  getApplications: (params) => api.get('/admin/applications/', { params }),
   getApplication: (id) => api.get(`/admin/applications/${id}/`),
   getApplicationDetails: (id) => api.get(`/admin/applications/${id}/details/`),
   updateApplication: (id, data) => api.put(`/admin/applications/${id}/`, data),
@@ -191,14 +207,14 @@ export const adminAPI = {
   viewPaymentProof: (id) => api.get(`/admin/applications/${id}/payment-proof/`),
   
   // Claims management
-  getClaims: () => api.get('/admin/claims/'),
+  getClaims: (params) => api.get('/admin/claims/', { params }),
   getClaim: (id) => api.get(`/admin/claims/${id}/`),
   updateClaim: (id, data) => api.put(`/admin/claims/${id}/`, data),
   approveClaim: (id, data) => api.post(`/admin/claims/${id}/approve/`, data),
   rejectClaim: (id) => api.post(`/admin/claims/${id}/reject/`),
   
   // Payments management
-  getPayments: () => api.get('/admin/payments/'),
+  getPayments: (params) => api.get('/admin/payments/', { params }),
   getPayment: (id) => api.get(`/admin/payments/${id}/`),
   updatePayment: (id, data) => api.put(`/admin/payments/${id}/`, data),
   markCompleted: (id) => api.post(`/admin/payments/${id}/mark_completed/`),
@@ -211,7 +227,7 @@ export const adminAPI = {
   markReplied: (id) => api.post(`/admin/contact/${id}/mark_replied/`),
   
   // Shares management
-  getShares: () => api.get('/admin/shares/'),
+  getShares: (params) => api.get('/admin/shares/', { params }),
   getShare: (id) => api.get(`/admin/shares/${id}/`),
   approveSharePurchase: (id, data) => api.post(`/admin/shares/${id}/approve/`, data),
   rejectSharePurchase: (id, data) => api.post(`/admin/shares/${id}/reject`, data),
@@ -220,7 +236,17 @@ export const adminAPI = {
   approvePayment: (id, data) => api.post(`/admin/payments/${id}/approve_payment/`, data),
   rejectPayment: (id, data) => api.post(`/admin/payments/${id}/reject_payment/`, data),
   getFinancialReport: () => api.get('/admin/payments/financial_report/'),
-  getSharesReport: () => api.get('/admin/payments/shares_report/'),
+  getSharesReport: (params) => api.get('/admin/payments/shares_report/', { params }),
+  getShareholders: (params) => api.get('/admin/payments/shareholders/', { params }),
+  
+  // Background report jobs
+  createReportJob: (kind, params) => api.post('/admin/reports/jobs/', { kind, params }),
+  getReportJob: (id) => api.get(`/admin/reports/jobs/${id}/`),
+  downloadReportJob: (id) => api.get(`/admin/reports/jobs/${id}/download/`, { responseType: 'blob' }),
+  
+  // CSV/XLSX exports - entity is applications, payments, claims, shares or members
+  exportEntity: (entity, fileFormat = 'csv', params) =>
+    api.get(`/admin/${entity}/export/${fileFormat}/`, { params, responseType: 'blob' }),
   
   // Meeting registrations
   getMeetingRegistrations: (id) => api.get(`/admin/meetings/${id}/registrations/`),
@@ -0,0 +1,48 @@
+import api from './api';
+
+const sha256Hex = async (blob) => {
+  const digest = await crypto.subtle.digest('SHA-256', await blob.arrayBuffer());
+  return Array.from(new Uint8Array(digest)).map((b) => b.toString(16).padStart(2, '0')).join('');
+};
+
+// Upload file for purpose ('id_document', 'evidence_file', ...) and return the token.
+// Pass the token from a previous attempt to resume where it stopped.
+export const chunkedUpload = async (file, purpose, { token, onProgress, retries = 5 } = {}) => {
+  let session = token
+    ? (await api.get(`/uploads/${token}/`)).data
+    : (await api.post('/uploads/', {
+        purpose, filename: file.name, size: file.size, content_type: file.type,
+      })).data;
+
+  let failures = 0;
+  while (session.status === 'uploading') {
+    const chunk = file.slice(session.offset, session.offset + session.chunk_size);
+    try {
+      const { data } = await api.patch(`/uploads/${session.token}/`, chunk, {
+        headers: {
+          'Content-Type': 'application/offset+octet-stream',
+          'Upload-Offset': session.offset,
+          'Upload-Checksum': `sha256 ${await sha256Hex(chunk)}`,
+        },
+      });
+      session = { ...session, ...data };
+      failures = 0;
+      if (onProgress) onProgress(session.offset / session.size);
+    } catch (error) {
+      if (error.response?.status === 409) {
+        session.offset = error.response.data.offset;  // Server says where to resume
+      } else if (++failures > retries) {
+        throw error;
+      } else {
+        await new Promise((resolve) => setTimeout(resolve, 1000 * 2 ** failures));
+        // The chunk may have been stored with only the response lost; ask where we are
+        try {
+          session = { ...session, ...(await api.get(`/uploads/${session.token}/`)).data };
+        } catch (syncError) {
+          // Unreachable again - retry the same chunk next time round
+        }
+      }
+    }
+  }
+  return session.token;
+};